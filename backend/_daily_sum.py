@@ -0,0 +1,49 @@
+"""
+Daily revenue reduction for the visualization engine
+Segmented sum over integer day keys, compiled with numba when it is installed
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, types
+except ImportError:
+    njit = None
+
+
+def _daily_sum_loop(day_idx_sorted, revenue_sorted):
+    """Single pass accumulator over day keys that are already sorted"""
+    n = day_idx_sorted.shape[0]
+    unique_days = np.empty(n, dtype=np.int64)
+    sums = np.empty(n, dtype=np.float64)
+    k = -1
+    for i in range(n):
+        if k < 0 or day_idx_sorted[i] != unique_days[k]:
+            k += 1
+            unique_days[k] = day_idx_sorted[i]
+            sums[k] = 0.0
+        sums[k] += revenue_sorted[i]
+    return unique_days[:k + 1], sums[:k + 1]
+
+
+def _daily_sum_numpy(day_idx_sorted, revenue_sorted):
+    """NumPy fallback: find run starts and reduce each run with reduceat"""
+    if day_idx_sorted.shape[0] == 0:
+        return day_idx_sorted.astype(np.int64), revenue_sorted.astype(np.float64)
+    starts = np.flatnonzero(np.r_[True, day_idx_sorted[1:] != day_idx_sorted[:-1]])
+    return day_idx_sorted[starts], np.add.reduceat(revenue_sorted, starts)
+
+
+# daily_sum(day_idx_sorted, revenue_sorted) -> (unique_days, sums)
+# The explicit signature compiles at import and cache=True reuses the machine code across workers.
+# Inputs are typed read-only so pandas' copy-on-write arrays match; writable arrays cast to it too
+if njit is not None:
+    daily_sum = njit(
+        types.Tuple((types.int64[:], types.float64[:]))(
+            types.Array(types.int64, 1, 'A', readonly=True),
+            types.Array(types.float64, 1, 'A', readonly=True),
+        ),
+        cache=True,
+    )(_daily_sum_loop)
+else:
+    daily_sum = _daily_sum_numpy
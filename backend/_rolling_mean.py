@@ -0,0 +1,56 @@
+"""
+Trailing moving average for the visualization engine
+Uses numbagg when installed, otherwise a numba (or NumPy) running-sum kernel
+"""
+
+import numpy as np
+
+try:
+    import numbagg
+except ImportError:
+    numbagg = None
+
+try:
+    from numba import njit, types
+except ImportError:
+    njit = None
+
+
+def _rolling_mean_loop(values, window):
+    """O(N) running sum; the first window-1 points average what is available"""
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    total = 0.0
+    for i in range(n):
+        total += values[i]
+        if i >= window:
+            total -= values[i - window]
+        out[i] = total / min(i + 1, window)
+    return out
+
+
+def _rolling_mean_numpy(values, window):
+    """NumPy fallback built on a cumulative sum"""
+    totals = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    ends = np.arange(1, values.shape[0] + 1)
+    starts = np.maximum(ends - window, 0)
+    return (totals[ends] - totals[starts]) / (ends - starts)
+
+
+# Compiled eagerly and cached on disk so worker boot skips LLVM; the input is typed read-only
+# so pandas' copy-on-write arrays match (writable arrays cast to it as well)
+if njit is not None:
+    _rolling_mean_kernel = njit(
+        types.float64[:](types.Array(types.float64, 1, 'A', readonly=True), types.int64),
+        cache=True,
+    )(_rolling_mean_loop)
+else:
+    _rolling_mean_kernel = _rolling_mean_numpy
+
+
+def rolling_mean(values, window):
+    """Equivalent of Series.rolling(window, min_periods=1).mean() for NaN-free data"""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if numbagg is not None:
+        return numbagg.move_mean(values, window=window, min_count=1)
+    return _rolling_mean_kernel(values, window)
@@ -5,20 +5,29 @@ Phase 2: Week 5-6 - Advanced Analytics & ML Models
 
 import pandas as pd
 import numpy as np
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from sklearn.ensemble import IsolationForest
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.preprocessing import StandardScaler
 import warnings
 warnings.filterwarnings('ignore')
 
+# Number of fitted anomaly results kept per AdvancedAnalytics instance
+ANOMALY_CACHE_SIZE = 32
+
+# Isolation Forest trees are built across all cores (n_jobs=-1) once the data is large enough
+# to outweigh the worker start-up; smaller inputs fit on a single core
+PARALLEL_FOREST_MIN_ROWS = 10000
+
 class AdvancedAnalytics:
     """Advanced analytics engine with ML-powered insights"""
     
     def __init__(self):
-        self.scaler = StandardScaler()
-        self.anomaly_detector = IsolationForest(contamination=0.1, random_state=42)
-        self.segmentation_model = KMeans(n_clusters=4, random_state=42)
+        self._anomaly_cache = OrderedDict()
+        self._anomaly_cache_lock = threading.Lock()
     
     def detect_trends(self, df, date_column, value_column, window_days=30):
         """Detect trends in time-series data"""
@@ -91,15 +100,7 @@ class AdvancedAnalytics:
             # Handle missing values
             numeric_data = numeric_data.fillna(numeric_data.mean())
             
-            # Scale the data
-            scaled_data = self.scaler.fit_transform(numeric_data)
-            
-            # Fit anomaly detection model
-            self.anomaly_detector.set_params(contamination=contamination)
-            anomaly_labels = self.anomaly_detector.fit_predict(scaled_data)
-            
-            # Get anomaly scores
-            anomaly_scores = self.anomaly_detector.decision_function(scaled_data)
+            anomaly_labels, anomaly_scores = self._fit_anomaly_detector(numeric_data, contamination)
             
             # Identify anomalies
             anomalies = df[anomaly_labels == -1].copy()
@@ -130,8 +131,45 @@ class AdvancedAnalytics:
         except Exception as e:
             return {"error": f"Anomaly detection failed: {str(e)}"}
     
-    def segment_customers(self, df, features, n_clusters=4):
-        """Customer segmentation using K-means clustering"""
+    def _fit_anomaly_detector(self, numeric_data, contamination):
+        """Fit the Isolation Forest, reusing results for data seen before.
+
+        The forest is seeded, so identical data and contamination always give
+        the same labels and scores; those are cached keyed by a hash of the
+        input so repeated analyses of unchanged data skip the refit.
+        """
+        values = np.ascontiguousarray(numeric_data.to_numpy(dtype=np.float64))
+        key = (hashlib.blake2b(values.tobytes()).digest(), values.shape, contamination)
+        
+        with self._anomaly_cache_lock:
+            cached = self._anomaly_cache.get(key)
+            if cached is not None:
+                self._anomaly_cache.move_to_end(key)
+                return cached
+        
+        # Scale the data
+        scaled_data = StandardScaler().fit_transform(values)
+        
+        # Fit anomaly detection model (a fresh forest per call, so concurrent requests never share one)
+        n_jobs = -1 if len(values) >= PARALLEL_FOREST_MIN_ROWS else None
+        detector = IsolationForest(contamination=contamination, random_state=42, n_jobs=n_jobs)
+        anomaly_labels = detector.fit_predict(scaled_data)
+        
+        # Get anomaly scores
+        anomaly_scores = detector.decision_function(scaled_data)
+        
+        with self._anomaly_cache_lock:
+            self._anomaly_cache[key] = (anomaly_labels, anomaly_scores)
+            if len(self._anomaly_cache) > ANOMALY_CACHE_SIZE:
+                self._anomaly_cache.popitem(last=False)
+        
+        return anomaly_labels, anomaly_scores
+    
+    def segment_customers(self, df, features, n_clusters=4, use_minibatch=False):
+        """Customer segmentation using K-means clustering
+        
+        use_minibatch=True fits MiniBatchKMeans instead of full K-means (faster on repeated small runs)
+        """
         try:
             # Prepare features for clustering
             feature_data = df[features].select_dtypes(include=[np.number])
@@ -142,11 +180,21 @@ class AdvancedAnalytics:
             feature_data = feature_data.fillna(feature_data.mean())
             
             # Scale the data
-            scaled_features = self.scaler.fit_transform(feature_data)
+            scaled_features = StandardScaler().fit_transform(feature_data)
             
             # Perform clustering
-            self.segmentation_model.set_params(n_clusters=n_clusters)
-            cluster_labels = self.segmentation_model.fit_predict(scaled_features)
+            if use_minibatch:
+                model = MiniBatchKMeans(
+                    n_clusters=n_clusters,
+                    batch_size=min(256, len(scaled_features)),
+                    n_init=3,
+                    max_no_improvement=10,
+                    random_state=42
+                )
+            else:
+                # A fresh model per call, so concurrent requests never share fitted centers
+                model = KMeans(n_clusters=n_clusters, random_state=42)
+            cluster_labels = model.fit_predict(scaled_features)
             
             # Add cluster labels to dataframe
             df_with_clusters = df.copy()
@@ -174,7 +222,7 @@ class AdvancedAnalytics:
                             }
             
             # Get cluster centers
-            cluster_centers = self.segmentation_model.cluster_centers_
+            cluster_centers = model.cluster_centers_
             
             # Create more interpretable cluster details
             cluster_details = []
@@ -221,7 +269,7 @@ class AdvancedAnalytics:
                 "cluster_centers": cluster_centers.tolist(),
                 "total_customers": len(df),
                 "features_used": features,
-                "segmentation_quality": float(self.segmentation_model.inertia_),
+                "segmentation_quality": float(model.inertia_),
                 "business_insights": business_insights
             }
             
@@ -3,6 +3,9 @@ import pandas as pd
 import numpy as np
 import io
 import os
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from werkzeug.utils import secure_filename
 import logging
@@ -84,8 +87,44 @@ def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() == 'csv'
 
+# Validation results kept for recently seen uploads, keyed by a content hash
+VALIDATION_CACHE_SIZE = 128
+_validation_cache = OrderedDict()
+_validation_cache_lock = threading.Lock()
+
+def _validation_key(df, expected_columns):
+    """Content hash of a DataFrame (values, columns, dtypes) plus the expected columns"""
+    digest = hashlib.blake2b(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(repr((list(df.columns), [str(dtype) for dtype in df.dtypes], df.shape)).encode())
+    return digest.digest(), tuple(expected_columns)
+
 def validate_csv_data(df, expected_columns):
-    """Validate CSV data and return quality score and issues"""
+    """Validate CSV data and return quality score and issues
+    
+    Identical uploads (same content and expected columns) reuse the cached result.
+    """
+    try:
+        key = _validation_key(df, expected_columns)
+    except TypeError:
+        # Unhashable cell values - validate without caching
+        return _validate_csv_data(df, expected_columns)
+    
+    with _validation_cache_lock:
+        cached = _validation_cache.get(key)
+        if cached is not None:
+            _validation_cache.move_to_end(key)
+    if cached is None:
+        cached = _validate_csv_data(df, expected_columns)
+        with _validation_cache_lock:
+            _validation_cache[key] = cached
+            if len(_validation_cache) > VALIDATION_CACHE_SIZE:
+                _validation_cache.popitem(last=False)
+    
+    quality_score, issues = cached
+    return quality_score, list(issues)
+
+def _validate_csv_data(df, expected_columns):
+    """Uncached validation behind validate_csv_data"""
     issues = []
     quality_score = 100
     
@@ -123,7 +162,8 @@ def validate_csv_data(df, expected_columns):
                         issues.append(f"Column '{col}' should contain dates")
                         quality_score -= 5
                 
-                if 'Price' in col or 'Cost' in col or 'Total' in col:
+                # Columns read_csv already parsed as numbers need no coercion check
+                if ('Price' in col or 'Cost' in col or 'Total' in col) and not pd.api.types.is_numeric_dtype(df[col]):
                     try:
                         pd.to_numeric(df[col], errors='coerce')
                     except:
@@ -833,8 +873,9 @@ def get_visualizations():
         return jsonify({'error': 'No data uploaded'}), 400
     
     try:
-        # Generate dashboard visualizations
-        dashboard = visualization_engine.generate_summary_dashboard(uploaded_data)
+        # Generate dashboard visualizations on the render pool
+        future = visualization_engine.render_chart_async('generate_summary_dashboard', uploaded_data)
+        dashboard = future.result()
         return jsonify(dashboard), 200
     
     except Exception as e:
@@ -859,7 +900,7 @@ def generate_chart(type):
             # Check for revenue columns
             revenue_cols = [col for col in df.columns if 'Total' in col or 'Value' in col or 'Amount' in col or 'Grand' in col]
             if revenue_cols:
-                chart_data = visualization_engine.generate_revenue_chart(df, chart_type)
+                chart_data = visualization_engine.render_chart_async('generate_revenue_chart', df, chart_type).result()
                 return jsonify(chart_data), 200
             else:
                 return jsonify({'error': 'No revenue columns found in orders data'}), 400
@@ -869,7 +910,7 @@ def generate_chart(type):
             # Check for spending columns
             spending_cols = [col for col in df.columns if 'Spent' in col or 'Value' in col or 'Amount' in col]
             if spending_cols:
-                chart_data = visualization_engine.generate_customer_segmentation_chart(df)
+                chart_data = visualization_engine.render_chart_async('generate_customer_segmentation_chart', df).result()
                 return jsonify(chart_data), 200
             else:
                 return jsonify({'error': 'No spending columns found in customers data'}), 400
@@ -879,7 +920,7 @@ def generate_chart(type):
             # Check for stock columns
             stock_cols = [col for col in df.columns if 'Stock' in col or 'Quantity' in col or 'Current' in col]
             if stock_cols:
-                chart_data = visualization_engine.generate_inventory_heatmap(df)
+                chart_data = visualization_engine.render_chart_async('generate_inventory_heatmap', df).result()
                 return jsonify(chart_data), 200
             else:
                 return jsonify({'error': 'No stock columns found in inventory data'}), 400
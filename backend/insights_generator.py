@@ -3,8 +3,13 @@ Enhanced AI Insights Generator for OLynk AI MVP
 Phase 2: Week 6 - ML-Powered Insights Generation
 """
 
+import gc
+import hashlib
+import os
 import pandas as pd
 import numpy as np
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # Import advanced analytics - use absolute import
@@ -14,6 +19,21 @@ except ImportError:
     # Fallback for when running as standalone module
     advanced_analytics = None
 
+# Polars is optional - weekly aggregation falls back to pandas without it
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# Datasets at least this large trigger an explicit gc pass once analyzed
+LARGE_DATASET_ROWS = 100_000
+
+# Upper bound on datasets analyzed concurrently
+ANALYZER_WORKERS = 4
+
+# Rows materialized from a streamed orders CSV for trend/anomaly analysis
+STREAMING_SAMPLE_ROWS = 100_000
+
 class InsightsGenerator:
     """AI-powered insights generator using advanced analytics"""
     
@@ -40,6 +60,9 @@ class InsightsGenerator:
                 "🔄 Optimization: {optimization_tip}"
             ]
         }
+        
+        # (hash of order totals, anomaly result) from the last revenue analysis
+        self._last_anomaly = None
     
     def generate_comprehensive_insights(self, data_dict):
         """Generate comprehensive insights from all uploaded data"""
@@ -47,36 +70,40 @@ class InsightsGenerator:
         recommendations = []
         
         try:
-            # Revenue and Order Analysis
-            if data_dict.get('orders'):
-                orders_df = pd.DataFrame(data_dict['orders'])
-                revenue_insights = self._analyze_revenue(orders_df)
-                insights.extend(revenue_insights['insights'])
-                recommendations.extend(revenue_insights['recommendations'])
-            
-            # Customer Analysis
-            if data_dict.get('customers'):
-                customers_df = pd.DataFrame(data_dict['customers'])
-                customer_insights = self._analyze_customers(customers_df)
-                insights.extend(customer_insights['insights'])
-                recommendations.extend(customer_insights['recommendations'])
+            # Each dataset is analyzed independently, so the analyzers run on a
+            # thread pool (pandas/NumPy/scikit-learn release the GIL in their
+            # C loops). Every worker drops its DataFrame as soon as it is done
+            # and only small summaries survive for the cross-dataset checks.
+            analyzers = [
+                ('orders', self._analyze_revenue),       # Revenue and Order Analysis
+                ('customers', self._analyze_customers),  # Customer Analysis
+                ('inventory', self._analyze_inventory),  # Inventory Analysis
+                ('products', self._analyze_products)     # Product Analysis
+            ]
+            uploaded = {data_type for data_type, _ in analyzers if self._has_data(data_dict.get(data_type))}
+            tasks = [(data_type, analyzer) for data_type, analyzer in analyzers if data_type in uploaded]
             
-            # Inventory Analysis
-            if data_dict.get('inventory'):
-                inventory_df = pd.DataFrame(data_dict['inventory'])
-                inventory_insights = self._analyze_inventory(inventory_df)
-                insights.extend(inventory_insights['insights'])
-                recommendations.extend(inventory_insights['recommendations'])
+            if len(tasks) <= 1:
+                outputs = [
+                    self._run_analyzer(data_type, analyzer, data_dict[data_type], uploaded)
+                    for data_type, analyzer in tasks
+                ]
+            else:
+                with ThreadPoolExecutor(max_workers=min(ANALYZER_WORKERS, len(tasks))) as executor:
+                    futures = [
+                        executor.submit(self._run_analyzer, data_type, analyzer, data_dict[data_type], uploaded)
+                        for data_type, analyzer in tasks
+                    ]
+                    outputs = [future.result() for future in futures]
             
-            # Product Analysis
-            if data_dict.get('products'):
-                products_df = pd.DataFrame(data_dict['products'])
-                product_insights = self._analyze_products(products_df)
-                insights.extend(product_insights['insights'])
-                recommendations.extend(product_insights['recommendations'])
+            summaries = {}
+            for (data_type, _), (result, summary) in zip(tasks, outputs):
+                summaries[data_type] = summary
+                insights.extend(result['insights'])
+                recommendations.extend(result['recommendations'])
             
             # Cross-dataset insights
-            cross_insights = self._generate_cross_dataset_insights(data_dict)
+            cross_insights = self._generate_cross_dataset_insights(summaries)
             insights.extend(cross_insights)
             
             # Add recommendations section
@@ -98,16 +125,104 @@ class InsightsGenerator:
                 'error': str(e)
             }
     
-    def _analyze_revenue(self, orders_df):
-        """Analyze revenue patterns and trends"""
+    def _run_analyzer(self, data_type, analyzer, source, uploaded):
+        """Load one dataset, analyze it and return (result, cross-analysis summary)"""
+        if data_type == 'orders' and pl is not None and self._is_csv_path(source):
+            streamed = self._analyze_revenue_csv(source, uploaded)
+            if streamed is not None:
+                return streamed
+        
+        if isinstance(source, pd.DataFrame):
+            df = source
+        elif self._is_csv_path(source):
+            df = pd.read_csv(source)
+        else:
+            df = pd.DataFrame(source)
+        summary = self._summarize_for_cross_analysis(data_type, df, uploaded)
+        result = analyzer(df)
+        
+        large_dataset = len(df) >= LARGE_DATASET_ROWS
+        del df
+        if large_dataset:
+            gc.collect()
+        
+        return result, summary
+    
+    def _column_hash(self, column):
+        """Content hash of a column, including its dtype"""
+        hashed = pd.util.hash_pandas_object(column, index=False).to_numpy()
+        digest = hashlib.blake2b(hashed.tobytes())
+        digest.update(str(column.dtype).encode())
+        return digest.digest()
+    
+    def _has_data(self, source):
+        """Whether a dataset was supplied; DataFrames count when they have rows"""
+        if isinstance(source, pd.DataFrame):
+            return not source.empty
+        return bool(source)
+    
+    def _is_csv_path(self, source):
+        """Datasets may be passed as a CSV file path instead of a list of records or a DataFrame"""
+        return isinstance(source, (str, os.PathLike))
+    
+    def _analyze_revenue_csv(self, path, uploaded):
+        """Analyze an orders CSV with Polars' streaming engine.
+
+        Revenue totals are aggregated over the whole file without loading it;
+        trend, anomaly and seasonality checks run on an evenly spaced sample
+        of at most STREAMING_SAMPLE_ROWS rows. Returns None when the file
+        lacks the columns needed, so the caller can fall back to pandas.
+        """
+        lf = pl.scan_csv(path, infer_schema_length=10000)
+        columns = lf.collect_schema().names()
+        if 'Total' not in columns or 'Order Date' not in columns:
+            return None
+        
+        total = pl.col('Total').cast(pl.Float64, strict=False)
+        stats = lf.select(
+            total.sum().alias('sum'),
+            total.count().alias('count'),
+            pl.col('Total').len().alias('rows')
+        ).collect(engine='streaming')
+        revenue_sum = stats['sum'][0] or 0.0
+        revenue_count = stats['count'][0]
+        avg_order_value = revenue_sum / revenue_count if revenue_count else 0.0
+        
+        # Ceiling division keeps the sample within STREAMING_SAMPLE_ROWS rows
+        step = max(1, -(-stats['rows'][0] // STREAMING_SAMPLE_ROWS))
+        sample = lf.gather_every(step).collect(engine='streaming')
+        sample_df = pd.DataFrame(sample.to_dict(as_series=False))
+        del sample
+        
+        summary = {}
+        if 'customers' in uploaded:
+            summary['total'] = revenue_sum
+            if 'Email' in columns:
+                emails = lf.select(pl.col('Email').drop_nulls().unique()).collect(engine='streaming')
+                summary['emails'] = set(emails.get_column('Email').to_list())
+        
+        result = self._analyze_revenue(sample_df, revenue_totals=(revenue_sum, avg_order_value))
+        return result, summary
+    
+    def _analyze_revenue(self, orders_df, revenue_totals=None):
+        """Analyze revenue patterns and trends
+
+        revenue_totals optionally supplies (total, average) computed over the
+        full dataset when orders_df is only a sample of it.
+        """
         insights = []
         recommendations = []
         
         try:
             if 'Total' in orders_df.columns and 'Order Date' in orders_df.columns:
                 # Basic revenue stats
-                total_revenue = pd.to_numeric(orders_df['Total'], errors='coerce').sum()
-                avg_order_value = pd.to_numeric(orders_df['Total'], errors='coerce').mean()
+                if revenue_totals is not None:
+                    total_revenue, avg_order_value = revenue_totals
+                else:
+                    totals = pd.to_numeric(orders_df['Total'], errors='coerce').to_numpy(dtype=np.float64)
+                    total_revenue = float(np.nansum(totals))
+                    order_count = np.count_nonzero(~np.isnan(totals))
+                    avg_order_value = total_revenue / order_count if order_count else 0.0
                 
                 insights.append(f"💰 **Revenue Overview**: Total revenue ₹{total_revenue:,.2f}")
                 insights.append(f"📊 Average order value: ₹{avg_order_value:,.2f}")
@@ -142,9 +257,16 @@ class InsightsGenerator:
                 # Anomaly detection (if available)
                 if advanced_analytics:
                     try:
-                        anomaly_analysis = advanced_analytics.detect_anomalies(
-                            orders_df, ['Total'], contamination=0.05
-                        )
+                        # Reuse the last result while the order totals are unchanged
+                        anomaly_hash = self._column_hash(orders_df['Total'])
+                        last_anomaly = self._last_anomaly
+                        if last_anomaly is not None and last_anomaly[0] == anomaly_hash:
+                            anomaly_analysis = last_anomaly[1]
+                        else:
+                            anomaly_analysis = advanced_analytics.detect_anomalies(
+                                orders_df, ['Total'], contamination=0.05
+                            )
+                            self._last_anomaly = (anomaly_hash, anomaly_analysis)
                         
                         if 'error' not in anomaly_analysis:
                             anomaly_count = anomaly_analysis['anomaly_count']
@@ -156,10 +278,9 @@ class InsightsGenerator:
                 
                 # Seasonal analysis
                 if 'Order Date' in orders_df.columns:
-                    orders_df['Order Date'] = pd.to_datetime(orders_df['Order Date'], errors='coerce')
-                    weekly_revenue = orders_df.groupby(orders_df['Order Date'].dt.isocalendar().week)['Total'].sum()
-                    if len(weekly_revenue) > 4:
-                        seasonality = weekly_revenue.std() / weekly_revenue.mean()
+                    weekly_revenue = self._weekly_revenue(orders_df['Order Date'], orders_df['Total'])
+                    if weekly_revenue.size > 4:
+                        seasonality = weekly_revenue.std(ddof=1) / weekly_revenue.mean()
                         if seasonality > 0.3:
                             insights.append("🔄 **Seasonality Detected**: Revenue shows weekly patterns")
                             recommendations.append("Plan inventory and marketing around weekly revenue cycles")
@@ -169,6 +290,25 @@ class InsightsGenerator:
         
         return {'insights': insights, 'recommendations': recommendations}
     
+    def _weekly_revenue(self, order_dates, totals):
+        """Sum revenue per ISO week number, returned as a NumPy array"""
+        dates = pd.to_datetime(order_dates, errors='coerce')
+        totals = pd.to_numeric(totals, errors='coerce')
+        
+        if pl is not None:
+            weekly = (
+                pl.DataFrame({
+                    'Order Date': pl.Series(dates.to_numpy()),
+                    'Total': pl.Series(totals.to_numpy(dtype=np.float64), nan_to_null=True)
+                })
+                .drop_nulls('Order Date')
+                .group_by(pl.col('Order Date').dt.week())
+                .agg(pl.col('Total').sum())
+            )
+            return weekly.get_column('Total').to_numpy()
+        
+        return totals.groupby(dates.dt.isocalendar().week).sum().to_numpy()
+    
     def _analyze_customers(self, customers_df):
         """Analyze customer behavior and segmentation"""
         insights = []
@@ -219,9 +359,10 @@ class InsightsGenerator:
                 
                 # Customer lifetime value analysis
                 if 'Last Order Date' in customers_df.columns:
-                    customers_df['Last Order Date'] = pd.to_datetime(customers_df['Last Order Date'], errors='coerce')
-                    recent_customers = customers_df[customers_df['Last Order Date'] >= (datetime.now() - timedelta(days=90))]
-                    active_percentage = (len(recent_customers) / customer_count) * 100
+                    cutoff = datetime.now() - timedelta(days=90)
+                    last_order_dates = pd.to_datetime(customers_df['Last Order Date'], errors='coerce')
+                    active_count = int(last_order_dates.ge(cutoff).sum())
+                    active_percentage = (active_count / customer_count) * 100
                     
                     insights.append(f"🔄 **Customer Activity**: {active_percentage:.1f}% of customers active in last 90 days")
                     
@@ -266,20 +407,19 @@ class InsightsGenerator:
                     
                     # ABC analysis (simple version)
                     if not on_hand_data.empty and not cost_data.empty:
-                        abc_data = pd.DataFrame({
-                            'quantity': on_hand_data,
-                            'cost': cost_data,
-                            'value': on_hand_data * cost_data
-                        }).dropna()
-                        
-                        if len(abc_data) > 0:
-                            total_value = abc_data['value'].sum()
-                            abc_data['percentage'] = abc_data['value'] / total_value * 100
-                            
+                        qty = on_hand_data.to_numpy(dtype=np.float64)
+                        cost = cost_data.to_numpy(dtype=np.float64)
+                        mask = ~(np.isnan(qty) | np.isnan(cost))
+                        values = (qty * cost)[mask]
+
+                        if len(values) > 0:
+                            total_value = values.sum()
+
                             # Top 20% items (A category)
-                            a_items = abc_data.nlargest(int(len(abc_data) * 0.2), 'value')
-                            a_percentage = a_items['percentage'].sum()
-                            
+                            k = max(1, int(len(values) * 0.2))
+                            top_sum = np.partition(values, -k)[-k:].sum()
+                            a_percentage = top_sum / total_value * 100
+
                             insights.append(f"📊 **ABC Analysis**: Top 20% of items represent {a_percentage:.1f}% of inventory value")
                             recommendations.append("Focus inventory management on high-value A-category items")
                 
@@ -320,25 +460,26 @@ class InsightsGenerator:
             
             # Category analysis
             if 'Product Category' in products_df.columns:
-                category_summary = products_df['Product Category'].value_counts()
-                top_categories = category_summary.head(3)
+                category_counts = Counter(products_df['Product Category'].dropna())
+                top_categories = category_counts.most_common(3)
                 
                 insights.append("🏷️ **Top Categories**:")
-                for category, count in top_categories.items():
+                for category, count in top_categories:
                     percentage = (count / total_products) * 100
                     insights.append(f"   • {category}: {count} products ({percentage:.1f}%)")
                 
-                if len(category_summary) > 5:
+                if len(category_counts) > 5:
                     recommendations.append("Consider consolidating or optimizing underperforming product categories")
             
             # Vendor analysis
             if 'Vendor' in products_df.columns:
-                vendor_summary = products_df['Vendor'].value_counts()
-                if len(vendor_summary) > 1:
-                    insights.append(f"🏢 **Vendor Diversity**: Products from {len(vendor_summary)} vendors")
+                vendor_count = products_df['Vendor'].nunique()
+                if vendor_count > 1:
+                    insights.append(f"🏢 **Vendor Diversity**: Products from {vendor_count} vendors")
                     
                     # Vendor concentration
-                    top_vendor_percentage = (vendor_summary.iloc[0] / total_products) * 100
+                    _, top_vendor_count = Counter(products_df['Vendor'].dropna()).most_common(1)[0]
+                    top_vendor_percentage = (top_vendor_count / total_products) * 100
                     if top_vendor_percentage > 50:
                         insights.append("⚠️ **Vendor Concentration**: High dependency on single vendor")
                         recommendations.append("Diversify vendor base to reduce supply chain risk")
@@ -357,19 +498,60 @@ class InsightsGenerator:
         
         return {'insights': insights, 'recommendations': recommendations}
     
-    def _generate_cross_dataset_insights(self, data_dict):
-        """Generate insights by combining data from multiple sources"""
+    def _summarize_for_cross_analysis(self, data_type, df, uploaded):
+        """Keep only the lightweight fields the cross-dataset checks need.
+
+        Email/SKU sets are only built when the dataset they are compared
+        against has been uploaded too.
+        """
+        summary = {}
+        
+        if data_type == 'orders':
+            if 'Total' in df.columns and 'customers' in uploaded:
+                summary['total'] = pd.to_numeric(df['Total'], errors='coerce').sum()
+            if 'Email' in df.columns and 'customers' in uploaded:
+                summary['emails'] = self._unique_values(df['Email'])
+        elif data_type == 'customers':
+            if 'Total Spent' in df.columns and 'orders' in uploaded:
+                summary['total'] = pd.to_numeric(df['Total Spent'], errors='coerce').sum()
+            if 'Email' in df.columns and 'orders' in uploaded:
+                summary['emails'] = self._unique_values(df['Email'])
+        elif data_type == 'inventory':
+            if 'SKU' in df.columns and 'products' in uploaded:
+                summary['skus'] = self._unique_values(df['SKU'])
+        elif data_type == 'products':
+            if 'Variant SKU' in df.columns and 'inventory' in uploaded:
+                summary['skus'] = self._unique_values(df['Variant SKU'])
+        
+        return summary
+    
+    def _unique_values(self, column):
+        """Set of non-null values, skipping set construction for all-null columns"""
+        if not column.notna().any():
+            return frozenset()
+        return set(column.dropna())
+    
+    def _set_differences(self, left, right):
+        """Return (left - right, right - left), short-circuiting when a side is empty"""
+        if not left or not right:
+            return left, right
+        return left - right, right - left
+    
+    def _generate_cross_dataset_insights(self, summaries):
+        """Generate insights by combining summaries from multiple sources"""
         cross_insights = []
         
         try:
+            orders = summaries.get('orders')
+            customers = summaries.get('customers')
+            inventory = summaries.get('inventory')
+            products = summaries.get('products')
+            
             # Revenue vs Customer correlation
-            if data_dict.get('orders') and data_dict.get('customers'):
-                orders_df = pd.DataFrame(data_dict['orders'])
-                customers_df = pd.DataFrame(data_dict['customers'])
-                
-                if 'Total' in orders_df.columns and 'Total Spent' in customers_df.columns:
-                    total_revenue = pd.to_numeric(orders_df['Total'], errors='coerce').sum()
-                    total_customer_spending = pd.to_numeric(customers_df['Total Spent'], errors='coerce').sum()
+            if orders is not None and customers is not None:
+                if 'total' in orders and 'total' in customers:
+                    total_revenue = orders['total']
+                    total_customer_spending = customers['total']
                     
                     if total_revenue > 0 and total_customer_spending > 0:
                         discrepancy = abs(total_revenue - total_customer_spending) / total_revenue * 100
@@ -378,36 +560,29 @@ class InsightsGenerator:
                             cross_insights.append("🔍 Review data consistency between orders and customer records")
             
             # Inventory vs Product correlation
-            if data_dict.get('inventory') and data_dict.get('products'):
-                inventory_df = pd.DataFrame(data_dict['inventory'])
-                products_df = pd.DataFrame(data_dict['products'])
-                
-                inventory_skus = set(inventory_df['SKU'].dropna())
-                product_skus = set(products_df['Variant SKU'].dropna())
-                
-                missing_inventory = product_skus - inventory_skus
-                missing_products = inventory_skus - product_skus
-                
-                if missing_inventory:
-                    cross_insights.append(f"📦 **Missing Inventory**: {len(missing_inventory)} products lack inventory records")
-                
-                if missing_products:
-                    cross_insights.append(f"🛍️ **Orphaned Inventory**: {len(missing_products)} inventory items without product records")
-                
-                if missing_inventory or missing_products:
-                    cross_insights.append("🔄 Action: Synchronize product and inventory data")
+            if inventory is not None and products is not None:
+                if 'skus' in inventory and 'skus' in products:
+                    inventory_skus = inventory['skus']
+                    product_skus = products['skus']
+                    
+                    missing_inventory, missing_products = self._set_differences(product_skus, inventory_skus)
+                    
+                    if missing_inventory:
+                        cross_insights.append(f"📦 **Missing Inventory**: {len(missing_inventory)} products lack inventory records")
+                    
+                    if missing_products:
+                        cross_insights.append(f"🛍️ **Orphaned Inventory**: {len(missing_products)} inventory items without product records")
+                    
+                    if missing_inventory or missing_products:
+                        cross_insights.append("🔄 Action: Synchronize product and inventory data")
             
             # Customer vs Order correlation
-            if data_dict.get('customers') and data_dict.get('orders'):
-                customers_df = pd.DataFrame(data_dict['customers'])
-                orders_df = pd.DataFrame(data_dict['orders'])
-                
-                if 'Email' in customers_df.columns and 'Email' in orders_df.columns:
-                    customer_emails = set(customers_df['Email'].dropna())
-                    order_emails = set(orders_df['Email'].dropna())
+            if customers is not None and orders is not None:
+                if 'emails' in customers and 'emails' in orders:
+                    customer_emails = customers['emails']
+                    order_emails = orders['emails']
                     
-                    customers_without_orders = customer_emails - order_emails
-                    orders_without_customers = order_emails - customer_emails
+                    customers_without_orders, orders_without_customers = self._set_differences(customer_emails, order_emails)
                     
                     if customers_without_orders:
                         cross_insights.append(f"👥 **Inactive Customers**: {len(customers_without_orders)} customers have no orders")
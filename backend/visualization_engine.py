@@ -10,31 +10,238 @@ matplotlib.use('Agg')  # Use non-interactive backend
 import pandas as pd
 import numpy as np
 import json
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
+from datetime import datetime
+import time
+import matplotlib.style
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 # Temporarily disable seaborn import to avoid conflicts
 # import seaborn as sns
 import io
+import atexit
 import base64
+import functools
+import hashlib
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from _daily_sum import daily_sum
+from _rolling_mean import rolling_mean
+
+# Rendered charts kept per engine; repeat dashboard loads on unchanged data skip the render
+CHART_CACHE_SIZE = 32
+
+# Dashboard images are shown at ~600px wide, 100 dpi is plenty; fast zlib level keeps encode cheap
+CHART_DPI = 100
+PNG_SAVE_OPTIONS = {'pil_kwargs': {'compress_level': 1}}
+
+# Base64 is encoded in slices that are a multiple of 3 bytes so the pieces concatenate cleanly
+B64_CHUNK_BYTES = 3 * 57 * 1024
+
+# Daily line charts up to this many points use the compact renderer at a screen-resolution dpi
+FAST_PATH_MAX_POINTS = 1000
+FAST_PATH_DPI = 72
+
+# Correlation heatmaps with more features than this are drawn without cell annotations
+MAX_ANNOTATED_FEATURES = 12
+
+# Background threads behind render_chart_async
+PNG_POOL_WORKERS = 2
+
+# Dashboard charts rendered in parallel (revenue, customers, inventory)
+DASHBOARD_WORKERS = 3
+
+# Stock level labels indexed by bucket; 'Low Stock' starts above zero and ends below 10
+STOCK_LEVELS = np.array(['Out of Stock', 'Low Stock', 'Medium Stock', 'High Stock'])
+STOCK_LEVEL_BINS = np.array([10, 50])
+
+# One reusable figure per worker thread instead of pyplot's global figure manager
+_tls = threading.local()
+
+def _get_fig(figsize):
+    """Return this thread's pooled figure, cleared and resized for the next chart"""
+    fig = getattr(_tls, 'fig', None)
+    if fig is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        _tls.fig = fig
+    else:
+        fig.clf()
+        fig.set_size_inches(figsize)
+    return fig
+
+# Date layouts seen in Shopify/GST exports, checked against the first value of the column
+ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+DATE_FORMATS = ('%m/%d/%Y', '%d/%m/%Y', '%m/%d/%Y %H:%M', '%d/%m/%Y %H:%M', '%d-%m-%Y', '%d-%m-%Y %H:%M')
+
+# Column-name patterns used to locate the charted columns
+COLUMN_PATTERNS = {
+    'revenue': re.compile(r'Total|Value|Amount|Grand'),
+    'date': re.compile(r'date', re.IGNORECASE),
+    'spending': re.compile(r'Spent|Value|Amount'),
+    'stock': re.compile(r'Stock|Quantity|Current'),
+}
+
+@functools.lru_cache(maxsize=256)
+def _matching_columns(kind, columns):
+    """Columns whose name matches the pattern for kind; memoized per column layout"""
+    pattern = COLUMN_PATTERNS[kind]
+    return tuple(col for col in columns if pattern.search(col))
+
+def _infer_date_format(dates):
+    """Pick an explicit to_datetime format from a sample value so parsing skips dateutil"""
+    first = dates.first_valid_index()
+    if first is None or not isinstance(dates[first], str):
+        return None
+    sample = dates[first].strip()
+    if ISO_DATE_RE.match(sample):
+        return 'ISO8601'
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(sample, fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
+
+def _wall_clock(dates):
+    """datetime64 array of a date column, tz-aware values kept at their local wall-clock time"""
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.to_numpy()
+
+def _day_index(dates):
+    """Whole days since the epoch as int64"""
+    return _wall_clock(dates).astype('datetime64[D]').view('i8')
+
+def _to_float(value):
+    """float() with pd.to_numeric(errors='coerce') semantics: unparseable values become NaN"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _record_values(records, key):
+    """One pass over a list of row dicts -> float64 array for key, or None if no row has it"""
+    present = False
+    
+    def values():
+        nonlocal present
+        for record in records:
+            if key in record:
+                present = True
+                yield _to_float(record[key])
+            else:
+                yield np.nan
+    
+    column = np.fromiter(values(), dtype=np.float64, count=len(records))
+    return column if present else None
+
+def _cached_chart(method):
+    """Memoize a chart method on a fingerprint of the frame it is drawn from"""
+    @functools.wraps(method)
+    def wrapper(self, df, *args):
+        key = self._chart_key(method.__name__, df, args)
+        if key is not None:
+            with self._chart_lock:
+                cached = self._chart_cache.get(key)
+                if cached is not None:
+                    self._chart_cache.move_to_end(key)
+                    return dict(cached)
+        
+        result = method(self, df, *args)
+        
+        if key is not None and 'error' not in result:
+            with self._chart_lock:
+                self._chart_cache[key] = dict(result)
+                while len(self._chart_cache) > CHART_CACHE_SIZE:
+                    self._chart_cache.popitem(last=False)
+        return result
+    return wrapper
+
+def _shutdown_engine(engine_ref):
+    """atexit hook holding only a weak reference, so registering it does not keep the engine alive"""
+    engine = engine_ref()
+    if engine is not None:
+        engine.shutdown()
 
 class VisualizationEngine:
     """Generate interactive charts and visualizations for the dashboard"""
     
-    def __init__(self):
+    def __init__(self, dpi=CHART_DPI):
+        self.dpi = dpi
+        self._chart_cache = OrderedDict()
+        self._chart_lock = threading.Lock()
+        # Created on the first render_chart_async call and shut down at exit
+        self._png_pool = None
+        self._png_pool_lock = threading.Lock()
+        self._atexit_hook = functools.partial(_shutdown_engine, weakref.ref(self))
+        
         # Set matplotlib style - use default style to avoid conflicts
         try:
-            plt.style.use('default')
+            matplotlib.style.use('default')
         except:
             pass  # Use default matplotlib style
         
         # Note: seaborn styling disabled to avoid import conflicts
     
+    def render_chart_async(self, chart_name, *args):
+        """Render and PNG-encode a chart in the background; returns a Future of the chart dict
+        
+        e.g. future = visualization_engine.render_chart_async('generate_revenue_chart', orders_df, 'line')
+        lets a request handler do its database round-trip before calling future.result()
+        """
+        return self._get_png_pool().submit(getattr(self, chart_name), *args)
+    
+    def _get_png_pool(self):
+        """Return the background render pool, starting it on first use"""
+        with self._png_pool_lock:
+            if self._png_pool is None:
+                # Each worker thread gets its own pooled figure
+                self._png_pool = ThreadPoolExecutor(max_workers=PNG_POOL_WORKERS, thread_name_prefix='chart-png')
+                atexit.register(self._atexit_hook)
+            return self._png_pool
+    
+    def shutdown(self):
+        """Stop the background render pool, cancelling queued renders (no-op if never started)"""
+        with self._png_pool_lock:
+            pool, self._png_pool = self._png_pool, None
+        if pool is not None:
+            atexit.unregister(self._atexit_hook)
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def _savefig_b64(self, fig, dpi=None, tight=True):
+        """Render the figure to PNG and base64-encode it straight from the buffer"""
+        img_buffer = io.BytesIO()
+        fig.savefig(img_buffer, format='png', dpi=dpi or self.dpi,
+                    bbox_inches='tight' if tight else None, **PNG_SAVE_OPTIONS)
+        
+        encoded = bytearray()
+        with img_buffer.getbuffer() as view:
+            for start in range(0, len(view), B64_CHUNK_BYTES):
+                encoded += base64.b64encode(view[start:start + B64_CHUNK_BYTES])
+        return encoded.decode('ascii')
+    
+    def _chart_key(self, chart_name, df, params):
+        """Cache key from the chart name, its parameters and a hash of the frame contents"""
+        try:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+            digest.update(repr(list(df.columns)).encode())
+            return (chart_name, params, digest.hexdigest())
+        except Exception:
+            # Unhashable cell values (nested dicts/lists) - just render uncached
+            return None
+    
     def generate_revenue_chart(self, orders_df, chart_type='line'):
         """Generate revenue visualization charts"""
         try:
             # Find revenue and date columns
-            revenue_cols = [col for col in orders_df.columns if 'Total' in col or 'Value' in col or 'Amount' in col or 'Grand' in col]
-            date_cols = [col for col in orders_df.columns if 'Date' in col or 'date' in col.lower()]
+            revenue_cols = _matching_columns('revenue', tuple(orders_df.columns))
+            date_cols = _matching_columns('date', tuple(orders_df.columns))
             
             if not revenue_cols or not date_cols:
                 return {"error": "Missing required columns for revenue chart (need revenue and date columns)"}
@@ -42,11 +249,15 @@ class VisualizationEngine:
             revenue_col = revenue_cols[0]
             date_col = date_cols[0]
             
-            # Prepare data
-            df = orders_df.copy()
-            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-            df[revenue_col] = pd.to_numeric(df[revenue_col], errors='coerce')
-            df = df.dropna(subset=[date_col, revenue_col])
+            # Prepare data - only the two charted columns, never a copy of the whole orders frame
+            raw_dates = orders_df[date_col]
+            date_format = _infer_date_format(raw_dates)
+            if date_format:
+                dates = pd.to_datetime(raw_dates, format=date_format, errors='coerce', cache=True)
+            else:
+                dates = pd.to_datetime(raw_dates, errors='coerce')
+            revenue = pd.to_numeric(orders_df[revenue_col], errors='coerce')
+            df = pd.DataFrame({date_col: dates, revenue_col: revenue}).dropna()
             
             if len(df) == 0:
                 return {"error": "No valid data for revenue chart"}
@@ -66,134 +277,152 @@ class VisualizationEngine:
         except Exception as e:
             return {"error": f"Revenue chart generation failed: {str(e)}"}
     
+    @_cached_chart
     def _create_revenue_line_chart(self, df, date_col, revenue_col):
         """Create line chart for revenue over time"""
         try:
-            # Group by date and sum revenue
-            daily_revenue = df.groupby(df[date_col].dt.date)[revenue_col].sum().reset_index()
-            daily_revenue[date_col] = pd.to_datetime(daily_revenue[date_col])
-            
-            # Create the plot
-            plt.figure(figsize=(12, 6))
-            plt.plot(daily_revenue[date_col], daily_revenue[revenue_col], 
-                    marker='o', linewidth=2, markersize=4)
-            
-            plt.title('Daily Revenue Trend', fontsize=16, fontweight='bold')
-            plt.xlabel('Date', fontsize=12)
-            plt.ylabel('Revenue (₹)', fontsize=12)
-            plt.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-            
-            # Add trend line
-            if len(daily_revenue) > 1:
-                z = np.polyfit(range(len(daily_revenue)), daily_revenue[revenue_col], 1)
-                p = np.poly1d(z)
-                trend_line = p(range(len(daily_revenue)))
-                plt.plot(daily_revenue[date_col], trend_line, 
-                        "--", alpha=0.8, color='red', label='Trend Line')
-                plt.legend()
-            
-            plt.tight_layout()
-            
-            # Convert to base64
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-            plt.close()
+            # Group by calendar day on integer day keys rather than boxed date objects
+            days = _day_index(df[date_col])
+            revenue = df[revenue_col].to_numpy(dtype=np.float64)
+            order = np.argsort(days, kind='stable')
+            daily_days, daily_totals = daily_sum(days[order], revenue[order])
+            # Plain arrays into matplotlib; float32 is ample precision for drawing currency
+            x = daily_days.astype('datetime64[D]')
+            y = daily_totals.astype(np.float32)
+            
+            if len(daily_totals) <= FAST_PATH_MAX_POINTS:
+                img_base64 = self._render_compact_line_chart(x, y)
+            else:
+                # Create the plot
+                fig = _get_fig((12, 6))
+                ax = fig.add_subplot(111)
+                ax.plot(x, y, marker='o', linewidth=2, markersize=4)
+                
+                ax.set_title('Daily Revenue Trend', fontsize=16, fontweight='bold')
+                ax.set_xlabel('Date', fontsize=12)
+                ax.set_ylabel('Revenue (₹)', fontsize=12)
+                ax.grid(True, alpha=0.3)
+                ax.tick_params(axis='x', labelrotation=45)
+                
+                # Add trend line
+                if len(daily_totals) > 1:
+                    z = np.polyfit(range(len(daily_totals)), daily_totals, 1)
+                    p = np.poly1d(z)
+                    trend_line = p(range(len(daily_totals))).astype(np.float32)
+                    ax.plot(x, trend_line, "--", alpha=0.8, color='red', label='Trend Line')
+                    ax.legend()
+                
+                fig.tight_layout()
+                
+                # Convert to base64
+                img_base64 = self._savefig_b64(fig)
             
             return {
                 "chart_type": "line",
                 "title": "Daily Revenue Trend",
                 "image": img_base64,
-                "data_points": len(daily_revenue),
-                "total_revenue": float(daily_revenue[revenue_col].sum()),
-                "avg_daily_revenue": float(daily_revenue[revenue_col].mean())
+                "data_points": len(daily_totals),
+                "total_revenue": float(daily_totals.sum()),
+                "avg_daily_revenue": float(daily_totals.mean())
             }
             
         except Exception as e:
             return {"error": f"Line chart creation failed: {str(e)}"}
     
+    def _render_compact_line_chart(self, x, y):
+        """Lightweight renderer for typical (<= FAST_PATH_MAX_POINTS days) daily series - no markers or trend line"""
+        fig = _get_fig((6, 3))
+        # Fixed margins instead of tight_layout / bbox_inches='tight', which each cost an extra draw
+        fig.subplots_adjust(left=0.14, right=0.97, top=0.88, bottom=0.27)
+        ax = fig.add_subplot(111)
+        ax.plot(x, y, linewidth=1)
+        
+        ax.set_title('Daily Revenue Trend', fontsize=11, fontweight='bold')
+        ax.set_xlabel('Date', fontsize=9)
+        ax.set_ylabel('Revenue (₹)', fontsize=9)
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(labelsize=7)
+        ax.tick_params(axis='x', labelrotation=45)
+        
+        return self._savefig_b64(fig, dpi=FAST_PATH_DPI, tight=False)
+    
+    @_cached_chart
     def _create_revenue_bar_chart(self, df, date_col, revenue_col):
         """Create bar chart for revenue by time period"""
         try:
-            # Group by week using a more compatible method
-            df['Week'] = df[date_col].dt.strftime('%Y-%U')  # Year-Week format
-            weekly_revenue = df.groupby('Week')[revenue_col].sum().reset_index()
+            # Bucket into Sunday-start weeks on integer keys (1970-01-04 was a Sunday);
+            # rows arrive sorted by date so the segmented day-sum kernel applies as is
+            weeks = (_day_index(df[date_col]) + 4) // 7
+            revenue = df[revenue_col].to_numpy(dtype=np.float64)
+            _, weekly_totals = daily_sum(weeks, revenue)
             
             # Create the plot
-            plt.figure(figsize=(14, 6))
-            bars = plt.bar(range(len(weekly_revenue)), weekly_revenue[revenue_col], 
+            fig = _get_fig((14, 6))
+            ax = fig.add_subplot(111)
+            bars = ax.bar(range(len(weekly_totals)), weekly_totals.astype(np.float32), 
                           color='skyblue', alpha=0.7)
             
-            plt.title('Weekly Revenue Performance', fontsize=16, fontweight='bold')
-            plt.xlabel('Week', fontsize=12)
-            plt.ylabel('Revenue (₹)', fontsize=12)
-            plt.grid(True, alpha=0.3)
+            ax.set_title('Weekly Revenue Performance', fontsize=16, fontweight='bold')
+            ax.set_xlabel('Week', fontsize=12)
+            ax.set_ylabel('Revenue (₹)', fontsize=12)
+            ax.grid(True, alpha=0.3)
             
             # Add value labels on bars
-            for bar in bars:
-                height = bar.get_height()
-                plt.text(bar.get_x() + bar.get_width()/2., height,
-                        f'₹{height:,.0f}', ha='center', va='bottom', fontsize=8)
+            ax.bar_label(bars, labels=[f'₹{total:,.0f}' for total in weekly_totals], fontsize=8, padding=2)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Convert to base64
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-            plt.close()
+            img_base64 = self._savefig_b64(fig)
             
             return {
                 "chart_type": "bar",
                 "title": "Weekly Revenue Performance",
                 "image": img_base64,
-                "data_points": len(weekly_revenue),
-                "total_revenue": float(weekly_revenue[revenue_col].sum()),
-                "avg_weekly_revenue": float(weekly_revenue[revenue_col].mean())
+                "data_points": len(weekly_totals),
+                "total_revenue": float(weekly_totals.sum()),
+                "avg_weekly_revenue": float(weekly_totals.mean())
             }
             
         except Exception as e:
             return {"error": f"Bar chart creation failed: {str(e)}"}
     
+    @_cached_chart
     def _create_revenue_trend_chart(self, df, date_col, revenue_col):
         """Create trend analysis chart with moving averages"""
         try:
             # Calculate moving averages
             df = df.sort_values(date_col)
-            df['MA_7'] = df[revenue_col].rolling(window=7, min_periods=1).mean()
-            df['MA_30'] = df[revenue_col].rolling(window=30, min_periods=1).mean()
+            revenue = df[revenue_col].to_numpy(dtype=np.float64)
+            ma_7 = rolling_mean(revenue, 7)
+            ma_30 = rolling_mean(revenue, 30)
             
             # Create the plot
-            plt.figure(figsize=(14, 7))
+            fig = _get_fig((14, 7))
+            ax = fig.add_subplot(111)
             
-            # Plot daily revenue
-            plt.plot(df[date_col], df[revenue_col], 'o-', alpha=0.6, 
+            # Plot daily revenue (plain float32 arrays rather than Series)
+            x = _wall_clock(df[date_col])
+            ax.plot(x, revenue.astype(np.float32), 'o-', alpha=0.6, 
                     label='Daily Revenue', markersize=3)
             
             # Plot moving averages
-            plt.plot(df[date_col], df['MA_7'], 'r-', linewidth=2, 
+            ax.plot(x, ma_7.astype(np.float32), 'r-', linewidth=2, 
                     label='7-Day Moving Average')
-            plt.plot(df[date_col], df['MA_30'], 'g-', linewidth=2, 
+            ax.plot(x, ma_30.astype(np.float32), 'g-', linewidth=2, 
                     label='30-Day Moving Average')
             
-            plt.title('Revenue Trend with Moving Averages', fontsize=16, fontweight='bold')
-            plt.xlabel('Date', fontsize=12)
-            plt.ylabel('Revenue (₹)', fontsize=12)
-            plt.legend()
-            plt.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
+            ax.set_title('Revenue Trend with Moving Averages', fontsize=16, fontweight='bold')
+            ax.set_xlabel('Date', fontsize=12)
+            ax.set_ylabel('Revenue (₹)', fontsize=12)
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+            ax.tick_params(axis='x', labelrotation=45)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Convert to base64
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-            plt.close()
+            img_base64 = self._savefig_b64(fig)
             
             return {
                 "chart_type": "trend",
@@ -201,79 +430,91 @@ class VisualizationEngine:
                 "image": img_base64,
                 "data_points": len(df),
                 "trend_analysis": {
-                    "current_7d_avg": float(df['MA_7'].iloc[-1]),
-                    "current_30d_avg": float(df['MA_30'].iloc[-1]),
-                    "trend_direction": "increasing" if df['MA_7'].iloc[-1] > df['MA_30'].iloc[-1] else "decreasing"
+                    "current_7d_avg": float(ma_7[-1]),
+                    "current_30d_avg": float(ma_30[-1]),
+                    "trend_direction": "increasing" if ma_7[-1] > ma_30[-1] else "decreasing"
                 }
             }
             
         except Exception as e:
             return {"error": f"Trend chart creation failed: {str(e)}"}
     
+    @_cached_chart
     def generate_customer_segmentation_chart(self, customers_df):
         """Generate customer segmentation visualization"""
         try:
             # Find spending columns
-            spending_cols = [col for col in customers_df.columns if 'Spent' in col or 'Value' in col or 'Amount' in col]
+            spending_cols = _matching_columns('spending', tuple(customers_df.columns))
             if not spending_cols:
                 return {"error": "Missing spending column for customer segmentation"}
             
             spending_col = spending_cols[0]
             
             # Prepare data
-            df = customers_df.copy()
-            df[spending_col] = pd.to_numeric(df[spending_col], errors='coerce')
-            df = df.dropna(subset=[spending_col])
+            spending = pd.to_numeric(customers_df[spending_col], errors='coerce').to_numpy(dtype=np.float64)
+            spending = spending[~np.isnan(spending)]
             
-            if len(df) == 0:
+            if spending.size == 0:
                 return {"error": "No valid data for customer segmentation"}
             
-            # Create spending distribution
-            plt.figure(figsize=(12, 6))
-            
-            # Histogram with KDE
-            plt.hist(df[spending_col], bins=20, alpha=0.7, color='skyblue', edgecolor='black')
-            plt.axvline(df[spending_col].mean(), color='red', linestyle='--', 
-                       label=f'Mean: ₹{df[spending_col].mean():,.0f}')
-            plt.axvline(df[spending_col].median(), color='green', linestyle='--', 
-                       label=f'Median: ₹{df[spending_col].median():,.0f}')
-            
-            plt.title('Customer Spending Distribution', fontsize=16, fontweight='bold')
-            plt.xlabel('Total Spent (₹)', fontsize=12)
-            plt.ylabel('Number of Customers', fontsize=12)
-            plt.legend()
-            plt.grid(True, alpha=0.3)
+            # Mean, std (ddof=1, as pandas) and median without a full sort
+            n = spending.size
+            mean_spending = spending.sum() / n
+            if n > 1:
+                # Centered second pass: the sum-of-squares shortcut cancels badly for large means
+                deviations = spending - mean_spending
+                std_spending = float(np.sqrt(np.dot(deviations, deviations) / (n - 1)))
+            else:
+                std_spending = float('nan')
+            middle = np.partition(spending, [(n - 1) // 2, n // 2])
+            median_spending = (middle[(n - 1) // 2] + middle[n // 2]) / 2
             
-            plt.tight_layout()
+            # Create spending distribution
+            fig = _get_fig((12, 6))
+            ax = fig.add_subplot(111)
+            
+            # Histogram - binned once in NumPy, drawn as plain bars
+            counts, edges = np.histogram(spending, bins=20)
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                   alpha=0.7, color='skyblue', edgecolor='black')
+            ax.axvline(mean_spending, color='red', linestyle='--', 
+                       label=f'Mean: ₹{mean_spending:,.0f}')
+            ax.axvline(median_spending, color='green', linestyle='--', 
+                       label=f'Median: ₹{median_spending:,.0f}')
+            
+            ax.set_title('Customer Spending Distribution', fontsize=16, fontweight='bold')
+            ax.set_xlabel('Total Spent (₹)', fontsize=12)
+            ax.set_ylabel('Number of Customers', fontsize=12)
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+            
+            fig.tight_layout()
             
             # Convert to base64
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-            plt.close()
+            img_base64 = self._savefig_b64(fig)
             
             return {
                 "chart_type": "distribution",
                 "title": "Customer Spending Distribution",
                 "image": img_base64,
-                "data_points": len(df),
+                "data_points": n,
                 "statistics": {
-                    "mean_spending": float(df[spending_col].mean()),
-                    "median_spending": float(df[spending_col].median()),
-                    "std_spending": float(df[spending_col].std()),
-                    "total_customers": len(df)
+                    "mean_spending": float(mean_spending),
+                    "median_spending": float(median_spending),
+                    "std_spending": std_spending,
+                    "total_customers": n
                 }
             }
             
         except Exception as e:
             return {"error": f"Customer segmentation chart failed: {str(e)}"}
     
+    @_cached_chart
     def generate_inventory_heatmap(self, inventory_df):
         """Generate inventory heatmap visualization"""
         try:
             # Find stock columns
-            stock_cols = [col for col in inventory_df.columns if 'Stock' in col or 'Quantity' in col or 'Current' in col]
+            stock_cols = _matching_columns('stock', tuple(inventory_df.columns))
             if not stock_cols:
                 return {"error": "Missing stock column for inventory heatmap"}
             
@@ -287,38 +528,28 @@ class VisualizationEngine:
             if len(df) == 0:
                 return {"error": "No valid data for inventory heatmap"}
             
-            # Create stock level categories
-            def categorize_stock(quantity):
-                if quantity == 0:
-                    return 'Out of Stock'
-                elif quantity < 10:
-                    return 'Low Stock'
-                elif quantity < 50:
-                    return 'Medium Stock'
-                else:
-                    return 'High Stock'
-            
-            df['Stock Level'] = df[stock_col].apply(categorize_stock)
+            # Bucket stock levels in one pass: 0 = out, 1 = low (<10), 2 = medium (<50), 3 = high
+            quantities = df[stock_col].to_numpy(dtype=np.float64)
+            level_idx = np.digitize(quantities, STOCK_LEVEL_BINS) + 1
+            level_idx[quantities == 0] = 0
+            level_counts = np.bincount(level_idx, minlength=len(STOCK_LEVELS))
             
             # Create the plot
-            plt.figure(figsize=(10, 6))
+            fig = _get_fig((10, 6))
+            ax = fig.add_subplot(111)
             
             # Stock level distribution
-            stock_counts = df['Stock Level'].value_counts()
+            stock_counts = pd.Series(STOCK_LEVELS[level_idx]).value_counts()
             colors = ['#ff6b6b', '#ffd93d', '#6bcf7f', '#4ecdc4']
             
-            plt.pie(stock_counts.values, labels=stock_counts.index, autopct='%1.1f%%',
+            ax.pie(stock_counts.values, labels=stock_counts.index, autopct='%1.1f%%',
                    colors=colors, startangle=90)
-            plt.title('Inventory Stock Level Distribution', fontsize=16, fontweight='bold')
+            ax.set_title('Inventory Stock Level Distribution', fontsize=16, fontweight='bold')
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # Convert to base64
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-            plt.close()
+            img_base64 = self._savefig_b64(fig)
             
             return {
                 "chart_type": "pie",
@@ -326,10 +557,10 @@ class VisualizationEngine:
                 "image": img_base64,
                 "data_points": len(df),
                 "stock_summary": {
-                    "out_of_stock": int((df[stock_col] == 0).sum()),
-                    "low_stock": int((df[stock_col] < 10).sum()),
-                    "medium_stock": int(((df[stock_col] >= 10) & (df[stock_col] < 50)).sum()),
-                    "high_stock": int((df[stock_col] >= 50).sum())
+                    "out_of_stock": int(level_counts[0]),
+                    "low_stock": int(level_counts[0] + level_counts[1]),
+                    "medium_stock": int(level_counts[2]),
+                    "high_stock": int(level_counts[3])
                 }
             }
             
@@ -345,35 +576,35 @@ class VisualizationEngine:
             if numeric_data.empty:
                 return {"error": "No numeric columns found for correlation analysis"}
             
-            # Calculate correlation matrix
-            corr_matrix = numeric_data.corr()
+            # Calculate correlation matrix on one contiguous float64 block (rows with any NaN dropped)
+            values = np.ascontiguousarray(numeric_data.to_numpy(dtype=np.float64))
+            values = values[np.isfinite(values).all(axis=1)]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr_values = np.atleast_2d(np.corrcoef(values, rowvar=False))
+            corr_matrix = pd.DataFrame(corr_values, index=numeric_data.columns, columns=numeric_data.columns)
             
             # Create the plot
-            plt.figure(figsize=(10, 8))
-            mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
+            fig = _get_fig((10, 8))
+            ax = fig.add_subplot(111)
             
             # Use matplotlib instead of seaborn for heatmap
-            plt.imshow(corr_matrix, cmap='coolwarm', aspect='auto')
-            plt.colorbar()
+            im = ax.imshow(corr_matrix, cmap='coolwarm', aspect='auto')
+            fig.colorbar(im, ax=ax)
             
-            # Add annotations
-            for i in range(len(corr_matrix.columns)):
-                for j in range(len(corr_matrix.columns)):
-                    plt.text(j, i, f'{corr_matrix.iloc[i, j]:.2f}', 
-                            ha='center', va='center', fontsize=8)
+            # Add annotations (skipped for large matrices where they would be unreadable anyway)
+            if len(corr_matrix.columns) <= MAX_ANNOTATED_FEATURES:
+                labels = np.char.mod('%.2f', corr_values)
+                for (i, j), label in np.ndenumerate(labels):
+                    ax.text(j, i, label, ha='center', va='center', fontsize=8)
             
-            plt.xticks(range(len(corr_matrix.columns)), corr_matrix.columns, rotation=45)
-            plt.yticks(range(len(corr_matrix.columns)), corr_matrix.columns)
+            ax.set_xticks(range(len(corr_matrix.columns)), corr_matrix.columns, rotation=45)
+            ax.set_yticks(range(len(corr_matrix.columns)), corr_matrix.columns)
             
-            plt.title('Feature Correlation Matrix', fontsize=16, fontweight='bold')
-            plt.tight_layout()
+            ax.set_title('Feature Correlation Matrix', fontsize=16, fontweight='bold')
+            fig.tight_layout()
             
             # Convert to base64
-            img_buffer = io.BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-            img_buffer.seek(0)
-            img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-            plt.close()
+            img_base64 = self._savefig_b64(fig)
             
             return {
                 "chart_type": "heatmap",
@@ -391,30 +622,31 @@ class VisualizationEngine:
         dashboard = {
             "charts": [],
             "summary": {},
-            "generated_at": datetime.now().isoformat()
+            "generated_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
         }
         
         try:
-            # Revenue chart
-            if data_dict.get('orders'):
-                orders_df = pd.DataFrame(data_dict['orders'])
-                revenue_chart = self.generate_revenue_chart(orders_df, 'trend')
-                if 'error' not in revenue_chart:
-                    dashboard["charts"].append(revenue_chart)
-            
-            # Customer segmentation
-            if data_dict.get('customers'):
-                customers_df = pd.DataFrame(data_dict['customers'])
-                customer_chart = self.generate_customer_segmentation_chart(customers_df)
-                if 'error' not in customer_chart:
-                    dashboard["charts"].append(customer_chart)
-            
-            # Inventory overview
-            if data_dict.get('inventory'):
-                inventory_df = pd.DataFrame(data_dict['inventory'])
-                inventory_chart = self.generate_inventory_heatmap(inventory_df)
-                if 'error' not in inventory_chart:
-                    dashboard["charts"].append(inventory_chart)
+            # Revenue trend, customer segmentation and inventory overview render concurrently,
+            # each on its worker thread's pooled figure; charts keep this order in the output
+            chart_jobs = [
+                (data_type, chart_method, args)
+                for data_type, chart_method, args in (
+                    ('orders', self.generate_revenue_chart, ('trend',)),
+                    ('customers', self.generate_customer_segmentation_chart, ()),
+                    ('inventory', self.generate_inventory_heatmap, ()),
+                )
+                if data_dict.get(data_type)
+            ]
+            if chart_jobs:
+                with ThreadPoolExecutor(max_workers=min(DASHBOARD_WORKERS, len(chart_jobs))) as executor:
+                    futures = [
+                        executor.submit(self._chart_from_records, chart_method, data_dict[data_type], args)
+                        for data_type, chart_method, args in chart_jobs
+                    ]
+                    for future in futures:
+                        chart = future.result()
+                        if 'error' not in chart:
+                            dashboard["charts"].append(chart)
             
             # Summary statistics
             dashboard["summary"] = self._generate_summary_stats(data_dict)
@@ -424,31 +656,35 @@ class VisualizationEngine:
         except Exception as e:
             return {"error": f"Dashboard generation failed: {str(e)}"}
     
+    def _chart_from_records(self, chart_method, records, args):
+        """Build the frame on the worker thread and render one dashboard chart"""
+        return chart_method(pd.DataFrame(records), *args)
+    
     def _generate_summary_stats(self, data_dict):
         """Generate summary statistics for the dashboard"""
         summary = {}
         
         try:
+            # Read the few columns needed straight off the records instead of building DataFrames
             if data_dict.get('orders'):
-                orders_df = pd.DataFrame(data_dict['orders'])
-                if 'Total' in orders_df.columns:
-                    total_revenue = pd.to_numeric(orders_df['Total'], errors='coerce').sum()
-                    summary['total_revenue'] = float(total_revenue)
-                    summary['total_orders'] = len(orders_df)
+                orders = data_dict['orders']
+                revenue = _record_values(orders, 'Total')
+                if revenue is not None:
+                    summary['total_revenue'] = float(np.nansum(revenue))
+                    summary['total_orders'] = len(orders)
             
             if data_dict.get('customers'):
-                customers_df = pd.DataFrame(data_dict['customers'])
-                summary['total_customers'] = len(customers_df)
-                if 'Total Spent' in customers_df.columns:
-                    total_spent = pd.to_numeric(customers_df['Total Spent'], errors='coerce').sum()
-                    summary['total_customer_spending'] = float(total_spent)
+                customers = data_dict['customers']
+                summary['total_customers'] = len(customers)
+                spent = _record_values(customers, 'Total Spent')
+                if spent is not None:
+                    summary['total_customer_spending'] = float(np.nansum(spent))
             
             if data_dict.get('inventory'):
-                inventory_df = pd.DataFrame(data_dict['inventory'])
-                if 'On Hand' in inventory_df.columns:
-                    on_hand = pd.to_numeric(inventory_df['On Hand'], errors='coerce')
-                    summary['low_stock_items'] = int((on_hand < 10).sum())
-                    summary['out_of_stock_items'] = int((on_hand == 0).sum())
+                on_hand = _record_values(data_dict['inventory'], 'On Hand')
+                if on_hand is not None:
+                    summary['low_stock_items'] = int(np.count_nonzero(on_hand < 10))
+                    summary['out_of_stock_items'] = int(np.count_nonzero(on_hand == 0))
             
             if data_dict.get('products'):
                 summary['total_products'] = len(data_dict['products'])
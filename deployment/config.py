@@ -33,6 +33,7 @@ class Config:
     
     # Performance
     WORKERS = 4
+    THREADS = 2
     TIMEOUT = 30
     
     # Monitoring
@@ -77,6 +78,7 @@ class ProductionConfig(Config):
     
     # Production performance
     WORKERS = int(os.environ.get('WORKERS', 4))
+    THREADS = int(os.environ.get('THREADS', 2))
     TIMEOUT = int(os.environ.get('TIMEOUT', 30))
     
     # SSL/TLS
@@ -6,33 +6,98 @@ Phase 3: Week 11 - Production Deployment
 
 import os
 import sys
+import atexit
 import logging
+import logging.handlers
+import threading
 from datetime import datetime
+from pathlib import Path
 
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
 def setup_environment():
     """Setup environment for Phase 3"""
-    # Create necessary directories
-    os.makedirs('uploads', exist_ok=True)
-    os.makedirs('logs', exist_ok=True)
+    # Create necessary directories (a stat when they already exist, instead of an EEXIST mkdir)
+    for directory in ('uploads', 'logs'):
+        path = Path(directory)
+        path.is_dir() or path.mkdir(parents=True, exist_ok=True)
     
     # Set environment variables
     os.environ.setdefault('FLASK_ENV', 'development')
     os.environ.setdefault('FLASK_APP', 'main.py')
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Buffered file log records are written at most this many seconds after they arrive;
+# set OLYNK_LOG_UNBUFFERED=1 to write every record straight to disk when debugging
+LOG_FLUSH_INTERVAL_SECONDS = 5
+
+# Gunicorn access-log records held in memory before each batched write to logs/access.log
+ACCESS_LOG_BUFFER_RECORDS = 2048
+
+class TimedMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes on a timer, so quiet periods don't strand records in memory"""
+    
+    def __init__(self, *args, interval=LOG_FLUSH_INTERVAL_SECONDS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.interval = interval
+        self._timer = None
+        # A timer pending at fork time does not exist in the child; let the child start its own
+        os.register_at_fork(after_in_child=self._forget_timer)
+    
+    def _forget_timer(self):
+        self._timer = None
+    
+    def emit(self, record):
+        super().emit(record)
+        with self.lock:
+            if self.buffer and self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def flush(self):
+        with self.lock:
+            super().flush()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
 def setup_logging():
     """Setup logging configuration"""
+    if os.environ.get('OLYNK_LOG_UNBUFFERED'):
+        file_handler = logging.FileHandler('logs/olynk.log')
+    else:
+        # File records are buffered in memory and written in batches of up to 1000,
+        # immediately when an ERROR comes through, and at least every LOG_FLUSH_INTERVAL_SECONDS
+        target = logging.FileHandler('logs/olynk.log')
+        target.setFormatter(logging.Formatter(LOG_FORMAT))
+        file_handler = TimedMemoryHandler(
+            capacity=1000,
+            flushLevel=logging.ERROR,
+            target=target,
+            flushOnClose=True
+        )
+        atexit.register(file_handler.flush)
+    
     # Configure logging for Phase 3
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        format=LOG_FORMAT,
         handlers=[
-            logging.FileHandler('logs/olynk.log'),
+            file_handler,
             logging.StreamHandler()
         ]
     )
+    return file_handler
+
+def flush_file_log(file_handler):
+    """Write out buffered log records, including the file stream behind them"""
+    file_handler.flush()
+    target = getattr(file_handler, 'target', None)
+    if target is not None:
+        target.flush()
 
 def print_startup_banner():
     """Print startup banner"""
@@ -49,7 +114,7 @@ def main():
     """Main application entry point"""
     print_startup_banner()
     setup_environment()
-    setup_logging()
+    file_handler = setup_logging()
     
     logger = logging.getLogger(__name__)
     
@@ -75,6 +140,52 @@ def main():
     if environment == 'production':
         # Use gunicorn for production
         import gunicorn.app.base
+        import gunicorn.glogging
+        
+        class BufferedAccessLogger(gunicorn.glogging.Logger):
+            """Gunicorn logger whose access log is written in batches instead of once per request"""
+            
+            def setup(self, cfg):
+                # On a re-setup (HUP) gunicorn drops the tagged handler without closing it,
+                # so write out and release the previous buffer first
+                for handler in list(self.access_log.handlers):
+                    if isinstance(handler, logging.handlers.MemoryHandler):
+                        target = handler.target
+                        handler.close()  # flushes into target, then detaches it
+                        if target is not None:
+                            target.close()
+                super().setup(cfg)
+                if os.environ.get('OLYNK_LOG_UNBUFFERED'):
+                    return
+                for handler in list(self.access_log.handlers):
+                    if isinstance(handler, logging.handlers.MemoryHandler):
+                        continue
+                    buffered = logging.handlers.MemoryHandler(
+                        capacity=ACCESS_LOG_BUFFER_RECORDS,
+                        flushLevel=logging.ERROR,
+                        target=handler,
+                        flushOnClose=True
+                    )
+                    # Tagged like gunicorn's own handler so a re-setup on HUP replaces it;
+                    # logging.shutdown() at exit closes it, which flushes (flushOnClose)
+                    buffered._gunicorn = True
+                    self.access_log.removeHandler(handler)
+                    self.access_log.addHandler(buffered)
+            
+            def reopen_files(self):
+                # gunicorn only reopens FileHandlers it can see, so drain and reopen the wrapped ones here
+                super().reopen_files()
+                for handler in self.access_log.handlers:
+                    target = getattr(handler, 'target', None)
+                    if isinstance(target, logging.FileHandler):
+                        handler.flush()
+                        target.acquire()
+                        try:
+                            if target.stream:
+                                target.stream.close()
+                                target.stream = target._open()
+                        finally:
+                            target.release()
         
         class StandaloneApplication(gunicorn.app.base.BaseApplication):
             def __init__(self, app, options=None):
@@ -92,16 +203,22 @@ def main():
         options = {
             'bind': f'{host}:{port}',
             'workers': int(os.environ.get('WORKERS', 4)),
+            'threads': int(os.environ.get('THREADS', 2)),
+            'worker_class': 'gthread',
             'timeout': int(os.environ.get('TIMEOUT', 30)),
-            'access_logfile': 'logs/access.log',
-            'error_logfile': 'logs/error.log',
+            'accesslog': 'logs/access.log',
+            'errorlog': 'logs/error.log',
+            'logger_class': BufferedAccessLogger,
             'loglevel': 'info'
         }
         
+        # Empty the log buffers before gunicorn forks; otherwise every worker inherits a copy
+        # of the startup records and writes it again when it exits
+        flush_file_log(file_handler)
         StandaloneApplication(app, options).run()
     else:
         # Use Flask development server
-        app.run(debug=True, host=host, port=port)
+        app.run(debug=True, host=host, port=port, threaded=True)
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
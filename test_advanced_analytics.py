@@ -6,13 +6,21 @@ Test script for advanced analytics endpoints
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = "http://localhost:5000"
 
+# Endpoint URLs built once at import
+HEALTH_URL = f"{BASE_URL}/health"
+ENDPOINTS = {t: f"{BASE_URL}/advanced-analysis/{t}" for t in ('trends', 'anomalies', 'segmentation', 'correlations')}
+
+# Shared keep-alive session for all requests
+SESSION = requests.Session()
+
 def test_health():
     """Test health endpoint"""
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(HEALTH_URL)
         print(f"Health check: {response.status_code}")
         if response.ok:
             data = response.json()
@@ -23,28 +31,39 @@ def test_health():
         print(f"Health check failed: {e}")
         return False
 
+def probe_analysis(analysis_type):
+    """POST one analysis type; returns (analysis_type, response or the exception raised)"""
+    try:
+        return analysis_type, SESSION.post(ENDPOINTS[analysis_type])
+    except Exception as e:
+        return analysis_type, e
+
 def test_advanced_analytics():
     """Test advanced analytics endpoints"""
     analysis_types = ['trends', 'anomalies', 'segmentation', 'correlations']
     
-    for analysis_type in analysis_types:
-        print(f"\n--- Testing {analysis_type} analysis ---")
-        try:
-            response = requests.post(f"{BASE_URL}/advanced-analysis/{analysis_type}")
+    # Fire all requests concurrently, report in the original order
+    with ThreadPoolExecutor(max_workers=len(analysis_types)) as executor:
+        for analysis_type, response in executor.map(probe_analysis, analysis_types):
+            print(f"\n--- Testing {analysis_type} analysis ---")
+            if isinstance(response, Exception):
+                print(f"Request failed: {response}")
+                continue
+            
             print(f"Status: {response.status_code}")
             
             if response.ok:
                 data = response.json()
                 print(f"Success: {data}")
-            else:
+            elif response.headers.get('content-type', '').startswith('application/json') and response.content:
                 try:
                     error_data = response.json()
                     print(f"Error: {error_data.get('error', 'Unknown error')}")
                 except:
                     print(f"Error: {response.text}")
-                    
-        except Exception as e:
-            print(f"Request failed: {e}")
+            else:
+                print(f"Error: {response.text}")
+            response.close()
 
 def main():
     print("Testing OLynk AI Advanced Analytics...")
@@ -6,17 +6,32 @@ Test script for OLynk AI Export Functionality
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = "http://localhost:5000"
+
+# Endpoint URLs built once at import
+EXPORT_URLS = {fmt: f"{BASE_URL}/export/{fmt}" for fmt in ('csv', 'pdf', 'excel', 'invalid')}
+
+# Empty-data export probes: (format, expected status, heading, success message)
+PROBES = [
+    ('csv', 400, "📊 Testing CSV Export (no data)", "CSV export correctly returns error when no data available"),
+    ('pdf', 400, "📄 Testing PDF Export (no data)", "PDF export correctly returns error when no data available"),
+    ('excel', 400, "📈 Testing Excel Export (no data)", "Excel export correctly returns error when no data available"),
+    ('invalid', 400, "🚫 Testing Invalid Export Format", "Invalid export format correctly returns error"),
+]
+
+# Shared keep-alive session for all requests
+SESSION = requests.Session()
 
 def test_export_functionality():
     """Test the export endpoints"""
-    base_url = "http://localhost:5000"
-    
     print("🧪 Testing OLynk AI Export Functionality...")
     print("=" * 50)
     
     # Test 1: Check if server is running
     try:
-        response = requests.get(f"{base_url}/")
+        response = SESSION.get(f"{BASE_URL}/")
         if response.status_code == 200:
             print("✅ Server is running")
         else:
@@ -26,81 +41,31 @@ def test_export_functionality():
         print("❌ Cannot connect to server. Make sure it's running on http://localhost:5000")
         return
     
-    # Test 2: Test CSV export with no data
-    print("\n📊 Testing CSV Export (no data)...")
-    try:
-        response = requests.post(
-            f"{base_url}/export/csv",
-            headers={"Content-Type": "application/json"},
-            json={"type": "all"}
-        )
-        
-        if response.status_code == 400:
-            print("✅ CSV export correctly returns error when no data available")
-            error_data = response.json()
-            print(f"   Error message: {error_data.get('error', 'Unknown error')}")
-        else:
-            print(f"❌ Unexpected response: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error testing CSV export: {e}")
-    
-    # Test 3: Test PDF export with no data
-    print("\n📄 Testing PDF Export (no data)...")
-    try:
-        response = requests.post(
-            f"{base_url}/export/pdf",
-            headers={"Content-Type": "application/json"},
-            json={"type": "all"}
-        )
-        
-        if response.status_code == 400:
-            print("✅ PDF export correctly returns error when no data available")
-            error_data = response.json()
-            print(f"   Error message: {error_data.get('error', 'Unknown error')}")
-        else:
-            print(f"❌ Unexpected response: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error testing PDF export: {e}")
+    # Tests 2-5: export probes with no data - independent, so they go out concurrently
+    # and are reported in order afterwards
+    def probe(fmt):
+        try:
+            return SESSION.post(EXPORT_URLS[fmt], json={"type": "all"})
+        except Exception as e:
+            return e
     
-    # Test 4: Test Excel export with no data
-    print("\n📈 Testing Excel Export (no data)...")
-    try:
-        response = requests.post(
-            f"{base_url}/export/excel",
-            headers={"Content-Type": "application/json"},
-            json={"type": "all"}
-        )
-        
-        if response.status_code == 400:
-            print("✅ Excel export correctly returns error when no data available")
-            error_data = response.json()
-            print(f"   Error message: {error_data.get('error', 'Unknown error')}")
-        else:
-            print(f"❌ Unexpected response: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error testing Excel export: {e}")
+    formats = [fmt for fmt, _, _, _ in PROBES]
+    with ThreadPoolExecutor(max_workers=len(formats)) as executor:
+        responses = dict(zip(formats, executor.map(probe, formats)))
     
-    # Test 5: Test invalid export format
-    print("\n🚫 Testing Invalid Export Format...")
-    try:
-        response = requests.post(
-            f"{base_url}/export/invalid",
-            headers={"Content-Type": "application/json"},
-            json={"type": "all"}
-        )
+    for fmt, expected_status, heading, success_message in PROBES:
+        print(f"\n{heading}...")
+        response = responses[fmt]
+        if isinstance(response, Exception):
+            print(f"❌ Error testing {fmt} export: {response}")
+            continue
         
-        if response.status_code == 400:
-            print("✅ Invalid export format correctly returns error")
-            error_data = response.json()
-            print(f"   Error message: {error_data.get('error', 'Unknown error')}")
+        if response.status_code == expected_status:
+            print(f"✅ {success_message}")
         else:
             print(f"❌ Unexpected response: {response.status_code}")
             print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error testing invalid export format: {e}")
+        response.close()
     
     print("\n" + "=" * 50)
     print("🎉 Export functionality test completed!")
@@ -4,8 +4,14 @@ Simple Phase 3 Test - Verify Core Functionality
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared keep-alive session for all requests
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
 
 def test_phase3_features():
     """Test Phase 3 features"""
@@ -17,7 +23,7 @@ def test_phase3_features():
     # Test 1: Health endpoint
     print("1. Testing health endpoint...")
     try:
-        response = requests.get(f"{base_url}/health", timeout=5)
+        response = SESSION.get(f"{base_url}/health", timeout=5)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Health endpoint working - Phase: {data.get('phase', 'Unknown')}")
@@ -32,7 +38,7 @@ def test_phase3_features():
     # Test 2: Analytics endpoint
     print("\n2. Testing analytics endpoint...")
     try:
-        response = requests.get(f"{base_url}/analytics", timeout=5)
+        response = SESSION.get(f"{base_url}/analytics", timeout=5)
         if response.status_code == 400:  # Expected when no data uploaded
             print("✅ Analytics endpoint working (no data uploaded)")
         elif response.status_code == 200:
@@ -45,9 +51,21 @@ def test_phase3_features():
     # Test 3: Template downloads
     print("\n3. Testing template downloads...")
     templates = ['products', 'orders', 'customers', 'inventory']
-    for template in templates:
+    
+    def probe_template(template):
+        try:
+            return template, SESSION.get(f"{base_url}/download-template/{template}", timeout=5)
+        except Exception as e:
+            return template, e
+    
+    # Downloads go out concurrently; results are reported in the original order
+    with ThreadPoolExecutor(max_workers=len(templates)) as executor:
+        template_results = list(executor.map(probe_template, templates))
+    
+    for template, response in template_results:
         try:
-            response = requests.get(f"{base_url}/download-template/{template}", timeout=5)
+            if isinstance(response, Exception):
+                raise response
             if response.status_code in [200, 404]:
                 status = "✅" if response.status_code == 200 else "⚠️"
                 print(f"{status} {template} template: {response.status_code}")
@@ -59,9 +77,20 @@ def test_phase3_features():
     # Test 4: Advanced analytics endpoints
     print("\n4. Testing advanced analytics endpoints...")
     analytics_types = ['trends', 'anomalies', 'correlations']
-    for analysis_type in analytics_types:
+    
+    def probe_analysis(analysis_type):
+        try:
+            return analysis_type, SESSION.post(f"{base_url}/advanced-analysis/{analysis_type}", timeout=5)
+        except Exception as e:
+            return analysis_type, e
+    
+    with ThreadPoolExecutor(max_workers=len(analytics_types)) as executor:
+        analysis_results = list(executor.map(probe_analysis, analytics_types))
+    
+    for analysis_type, response in analysis_results:
         try:
-            response = requests.post(f"{base_url}/advanced-analysis/{analysis_type}", timeout=5)
+            if isinstance(response, Exception):
+                raise response
             if response.status_code in [200, 400]:  # 400 expected when no data
                 status = "✅" if response.status_code == 200 else "⚠️"
                 print(f"{status} {analysis_type} analysis: {response.status_code}")
@@ -73,8 +102,8 @@ def test_phase3_features():
     # Test 5: Chart generation
     print("\n5. Testing chart generation...")
     try:
-        response = requests.post(f"{base_url}/charts/revenue", 
-                               json={'chart_type': 'line'}, timeout=10)
+        response = SESSION.post(f"{base_url}/charts/revenue", 
+                              json={'chart_type': 'line'}, timeout=10)
         if response.status_code in [200, 400]:  # 400 expected when no data
             status = "✅" if response.status_code == 200 else "⚠️"
             print(f"{status} Chart generation: {response.status_code}")
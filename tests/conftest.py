@@ -0,0 +1,257 @@
+"""
+Shared pytest fixtures for the OLynk AI MVP test suite
+"""
+
+import hashlib
+import inspect
+import os
+import sys
+import tempfile
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+def pytest_configure(config):
+    # xdist_group is pytest-xdist's marker; registered here too so runs without xdist don't warn
+    config.addinivalue_line("markers", "xdist_group(name): keep tests of one group on the same xdist worker")
+
+class InProcessAdapter(BaseAdapter):
+    """requests transport that hands each request straight to the Flask app (no socket, no server)"""
+    
+    def __init__(self, app):
+        super().__init__()
+        self.client = app.test_client()
+    
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        body = request.body
+        if hasattr(body, 'read'):
+            body = body.read()
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        
+        app_response = self.client.open(url.path, method=request.method, query_string=url.query,
+                                        headers=dict(request.headers), data=body)
+        
+        response = requests.Response()
+        response.status_code = app_response.status_code
+        response.reason = app_response.status.partition(' ')[2]
+        response.headers = CaseInsensitiveDict(app_response.headers)
+        response._content = app_response.get_data()
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        return response
+    
+    def close(self):
+        pass
+
+@pytest.fixture(scope="session")
+def http():
+    """Keep-alive HTTP session shared by every test; OLYNK_TEST_CLIENT=1 serves it in-process via app.test_client()"""
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    if os.environ.get('OLYNK_TEST_CLIENT') == '1':
+        from app import app
+        adapter = InProcessAdapter(app)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    yield session
+    session.close()
+
+# Sample datasets are built once per test session; tests only read them (serialize to CSV).
+# Columns come from NumPy ranges and per-row constants tiled to length n
+
+_LETTERS = list('ABCDEFGHIJ')
+_PRODUCT_NAMES = [f'Product {c}' for c in _LETTERS]
+_FIRST_NAMES = ['John', 'Jane', 'Bob', 'Alice', 'Charlie', 'Diana', 'Edward', 'Fiona', 'George', 'Helen']
+_LAST_NAMES = ['Doe', 'Smith', 'Johnson', 'Brown', 'Wilson', 'Davis', 'Miller', 'Garcia', 'Martinez', 'Anderson']
+_CATEGORIES = ['Electronics', 'Clothing', 'Books', 'Home', 'Sports']
+_PAYMENT_METHODS = ['Credit Card', 'Cash']
+_SKUS = [f'SKU{i:03d}' for i in range(1, 11)]
+
+def _days(start, n):
+    """n consecutive daily dates as YYYY-MM-DD strings"""
+    return pd.date_range(start, periods=n).strftime('%Y-%m-%d')
+
+def _months(start, n):
+    """n month-start dates as YYYY-MM-DD strings"""
+    return pd.date_range(start, periods=n, freq='MS').strftime('%Y-%m-%d')
+
+def make_orders(n=10):
+    """Sample orders data with n rows"""
+    quantity = np.resize([2, 3, 4, 2, 3, 5, 6, 1, 3, 4], n)
+    unit_price = np.arange(50, 50 + 10 * n, 10)
+    return pd.DataFrame({
+        'Order ID': np.arange(1, n + 1),
+        'Order Date': _days('2024-01-01', n),
+        'Customer ID': np.arange(101, 101 + n),
+        'Customer Name': np.resize([f'{f} {l}' for f, l in zip(_FIRST_NAMES, _LAST_NAMES)], n),
+        'Product ID': np.arange(201, 201 + n),
+        'Product Name': np.resize(_PRODUCT_NAMES, n),
+        'Quantity': quantity,
+        'Unit Price': unit_price,
+        'Total Amount': quantity * unit_price,
+        'Payment Method': np.resize(_PAYMENT_METHODS, n),
+        'Order Status': np.full(n, 'Completed')
+    })
+
+def make_customers(n=10):
+    """Sample customers data with n rows"""
+    first_names = np.resize(_FIRST_NAMES, n)
+    return pd.DataFrame({
+        'Customer ID': np.arange(101, 101 + n),
+        'First Name': first_names,
+        'Last Name': np.resize(_LAST_NAMES, n),
+        'Email': np.char.add(np.char.lower(first_names), '@test.com'),
+        'Registration Date': _months('2023-01-01', n),
+        'Total Orders': np.resize([5, 7, 3, 4, 6, 8, 2, 9, 1, 10], n),
+        'Total Spent': np.resize([500, 750, 300, 450, 600, 800, 200, 900, 100, 1000], n),
+        'Average Order Value': np.resize([100, 107, 100, 112, 100, 100, 100, 100, 100, 100], n),
+        'Last Order Date': _days('2024-01-01', n),
+        'Preferred Payment Method': np.resize(_PAYMENT_METHODS, n),
+        'Customer Segment': np.resize(['Premium', 'Regular'], n)
+    })
+
+def make_products(n=10):
+    """Sample products data with n rows"""
+    side = np.arange(10, 10 + 5 * n, 5).astype(str)
+    return pd.DataFrame({
+        'Product ID': np.arange(201, 201 + n),
+        'Product Name': np.resize(_PRODUCT_NAMES, n),
+        'Category': np.resize(_CATEGORIES, n),
+        'Brand': np.resize([f'Brand {c}' for c in _LETTERS], n),
+        'Price': np.arange(50, 50 + 10 * n, 10),
+        'Cost': np.arange(30, 30 + 10 * n, 10),
+        'SKU': np.resize(_SKUS, n),
+        'Stock Quantity': np.arange(100, 100 + 50 * n, 50),
+        'Weight (g)': np.arange(100, 100 + 50 * n, 50),
+        'Dimensions (cm)': np.char.add(np.char.add(np.char.add(side, 'x'), np.char.add(side, 'x')), side),
+        'Launch Date': _months('2023-01-01', n),
+        'Last Updated': _days('2024-01-01', n),
+        'Tags': np.char.add('tag', np.arange(1, n + 1).astype(str)),
+        'Description': np.resize([f'Description {c}' for c in _LETTERS], n),
+        'Status': np.full(n, 'Active')
+    })
+
+def make_inventory(n=10):
+    """Sample inventory data with n rows"""
+    current_stock = np.arange(100, 100 + 50 * n, 50)
+    unit_cost = np.arange(30, 30 + 10 * n, 10)
+    return pd.DataFrame({
+        'Inventory ID': np.arange(301, 301 + n),
+        'Product ID': np.arange(201, 201 + n),
+        'Product Name': np.resize(_PRODUCT_NAMES, n),
+        'SKU': np.resize(_SKUS, n),
+        'Location': np.resize([f'Warehouse {c}' for c in _LETTERS], n),
+        'Warehouse': np.full(n, 'Main'),
+        'Current Stock': current_stock,
+        'Minimum Stock': current_stock // 10,
+        'Maximum Stock': current_stock * 10,
+        'Unit Cost': unit_cost,
+        'Total Value': current_stock * unit_cost,
+        'Last Restocked': _days('2024-01-01', n),
+        'Next Restock Date': _days('2024-02-01', n),
+        'Stock Status': np.full(n, 'In Stock'),
+        'Category': np.resize(_CATEGORIES, n),
+        'Supplier': np.resize([f'Supplier {c}' for c in _LETTERS], n),
+        'Lead Time (Days)': np.resize([7, 10, 14, 21, 30], n),
+        'Reorder Point': np.arange(20, 20 + 10 * n, 10)
+    })
+
+@pytest.fixture(scope="session")
+def sample_orders():
+    """Sample orders data (10 rows)"""
+    return make_orders()
+
+@pytest.fixture(scope="session")
+def sample_customers():
+    """Sample customers data (10 rows)"""
+    return make_customers()
+
+@pytest.fixture(scope="session")
+def sample_products():
+    """Sample products data (10 rows)"""
+    return make_products()
+
+@pytest.fixture(scope="session")
+def sample_inventory():
+    """Sample inventory data (10 rows)"""
+    return make_inventory()
+
+# CSV payloads are serialized once per session and posted from memory (io.BytesIO) by the tests.
+# The bytes are also kept on disk under .pytest_cache so later sessions skip the build + to_csv step
+
+# Bump to invalidate every cached payload by hand
+CSV_CACHE_VERSION = 1
+
+def _csv_cache_key(builder, n):
+    """Hash of everything the cached bytes depend on: the whole module defining the builder
+    (helpers and constants included), the row count and the pandas/NumPy versions doing the to_csv"""
+    module_source = inspect.getsource(sys.modules[builder.__module__])
+    parts = (CSV_CACHE_VERSION, builder.__name__, n, pd.__version__, np.__version__, module_source)
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+def cached_csv(cache_dir, name, builder, n=10):
+    """CSV bytes for builder(n), read from cache_dir when a file for this generator is already there"""
+    path = cache_dir / f'{name}-{_csv_cache_key(builder, n)}.csv'
+    if path.is_file():
+        return path.read_bytes()
+    
+    data = builder(n).to_csv(index=False).encode()
+    if cache_dir.is_dir():
+        # xdist workers share the directory: write a private temp file, then rename it into place
+        # atomically so no worker ever reads a partially written payload
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    return data
+
+@pytest.fixture(scope="session")
+def csv_cache_dir(request):
+    """Directory for cached CSV payloads (.pytest_cache/d/olynk)"""
+    cache = getattr(request.config, 'cache', None)
+    if cache is None:
+        # Cache provider disabled (-p no:cacheprovider): build in memory every session
+        return Path(os.devnull)
+    return Path(cache.mkdir('olynk'))
+
+@pytest.fixture(scope="session")
+def orders_csv_bytes(csv_cache_dir):
+    """Sample orders data as CSV bytes"""
+    return cached_csv(csv_cache_dir, 'orders', make_orders)
+
+@pytest.fixture(scope="session")
+def customers_csv_bytes(csv_cache_dir):
+    """Sample customers data as CSV bytes"""
+    return cached_csv(csv_cache_dir, 'customers', make_customers)
+
+@pytest.fixture(scope="session")
+def products_csv_bytes(csv_cache_dir):
+    """Sample products data as CSV bytes"""
+    return cached_csv(csv_cache_dir, 'products', make_products)
+
+@pytest.fixture(scope="session")
+def inventory_csv_bytes(csv_cache_dir):
+    """Sample inventory data as CSV bytes"""
+    return cached_csv(csv_cache_dir, 'inventory', make_inventory)
+
+@pytest.fixture(scope="session")
+def perf_orders_csv_bytes(csv_cache_dir):
+    """100 sample orders as CSV bytes (performance uploads)"""
+    return cached_csv(csv_cache_dir, 'orders', make_orders, n=100)
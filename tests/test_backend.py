@@ -7,8 +7,14 @@ Phase 3: Week 9 - Testing & Quality Assurance
 import unittest
 import sys
 import os
+import io
+import gc
+import types
+import importlib.util
 import tempfile
-import json
+import weakref
+from unittest import mock
+import httpx
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -17,23 +23,36 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 from app import app, uploaded_data, validate_csv_data, allowed_file
+import supabase_config
+import insights_generator
+import visualization_engine
+
+# orjson is optional - fall back to stdlib JSON parsing when it is missing
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+def _json(response):
+    """Parse a test-client response body as JSON"""
+    return _loads(response.data)
+
+_client = None
+
+def setUpModule():
+    """Create one test client for the module and warm routing/logging with a first request"""
+    global _client
+    _client = app.test_client()
+    _client.testing = True
+    _client.get('/health')
 
 class TestBackend(unittest.TestCase):
     """Test cases for backend functionality"""
     
-    def setUp(self):
-        """Set up test environment"""
-        self.app = app.test_client()
-        self.app.testing = True
-        
-        # Clear uploaded data for each test
-        uploaded_data['products'] = []
-        uploaded_data['orders'] = []
-        uploaded_data['customers'] = []
-        uploaded_data['inventory'] = []
-        
-        # Create sample test data
-        self.sample_orders = pd.DataFrame({
+    @classmethod
+    def setUpClass(cls):
+        """Create sample test data once for the whole class"""
+        cls.sample_orders = pd.DataFrame({
             'Order ID': [1, 2, 3, 4, 5],
             'Order Date': ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05'],
             'Customer ID': [101, 102, 103, 104, 105],
@@ -41,7 +60,7 @@ class TestBackend(unittest.TestCase):
             'Quantity': [2, 3, 4, 2, 3]
         })
         
-        self.sample_customers = pd.DataFrame({
+        cls.sample_customers = pd.DataFrame({
             'Customer ID': [101, 102, 103, 104, 105],
             'First Name': ['John', 'Jane', 'Bob', 'Alice', 'Charlie'],
             'Last Name': ['Doe', 'Smith', 'Johnson', 'Brown', 'Wilson'],
@@ -49,11 +68,24 @@ class TestBackend(unittest.TestCase):
             'Total Spent': [500, 750, 300, 450, 600],
             'Total Orders': [5, 7, 3, 4, 6]
         })
+        
+        # Orders CSV serialized once; uploads read it from memory
+        cls.sample_orders_csv = cls.sample_orders.to_csv(index=False).encode()
+    
+    def setUp(self):
+        """Set up test environment"""
+        self.app = _client
+        
+        # Clear uploaded data for each test
+        uploaded_data['products'] = []
+        uploaded_data['orders'] = []
+        uploaded_data['customers'] = []
+        uploaded_data['inventory'] = []
     
     def test_health_endpoint(self):
         """Test health check endpoint"""
         response = self.app.get('/health')
-        data = json.loads(response.data)
+        data = _json(response)
         
         self.assertEqual(response.status_code, 200)
         self.assertEqual(data['status'], 'healthy')
@@ -97,21 +129,12 @@ class TestBackend(unittest.TestCase):
     
     def test_upload_endpoint(self):
         """Test file upload endpoint"""
-        # Create temporary CSV file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            self.sample_orders.to_csv(f.name, index=False)
-            f.flush()
-            
-            with open(f.name, 'rb') as csv_file:
-                response = self.app.post('/upload/orders',
-                                       data={'file': (csv_file, 'orders.csv')},
-                                       content_type='multipart/form-data')
-        
-        # Clean up
-        os.unlink(f.name)
+        response = self.app.post('/upload/orders',
+                               data={'file': (io.BytesIO(self.sample_orders_csv), 'orders.csv')},
+                               content_type='multipart/form-data')
         
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
+        data = _json(response)
         self.assertIn('message', data)
         self.assertIn('data', data)
         self.assertEqual(data['data']['rows'], 5)
@@ -136,7 +159,7 @@ class TestBackend(unittest.TestCase):
         response = self.app.get('/analytics')
         self.assertEqual(response.status_code, 200)
         
-        data = json.loads(response.data)
+        data = _json(response)
         self.assertIn('total_revenue', data)
         self.assertIn('total_customers', data)
         self.assertIn('total_products', data)
@@ -157,7 +180,7 @@ class TestBackend(unittest.TestCase):
         response = self.app.get('/insights')
         self.assertEqual(response.status_code, 200)
         
-        data = json.loads(response.data)
+        data = _json(response)
         self.assertIn('insights', data)
         self.assertGreater(len(data['insights']), 0)
     
@@ -170,7 +193,7 @@ class TestBackend(unittest.TestCase):
                                json={'message': 'What is the total revenue?'})
         self.assertEqual(response.status_code, 200)
         
-        data = json.loads(response.data)
+        data = _json(response)
         self.assertIn('response', data)
     
     def test_advanced_analysis_endpoint(self):
@@ -247,5 +270,161 @@ class TestDataProcessing(unittest.TestCase):
         self.assertTrue(pd.isna(date_col.iloc[2]))  # invalid date
         self.assertTrue(pd.isna(date_col.iloc[3]))  # empty date
 
+class TestChartStatistics(unittest.TestCase):
+    """Test the summary statistics returned with charts"""
+    
+    def test_spending_std_large_mean(self):
+        """Test the spending std stays exact when the mean dwarfs the spread"""
+        spending = pd.Series([1e9 + 1, 1e9 + 2, 1e9 + 3, 1e9 + 4])
+        chart = visualization_engine.VisualizationEngine().generate_customer_segmentation_chart(
+            pd.DataFrame({'Total Spent': spending})
+        )
+        self.assertAlmostEqual(chart['statistics']['std_spending'], spending.std(), places=9)
+
+class TestAsyncChartRendering(unittest.TestCase):
+    """Test background chart rendering on the visualization engine"""
+    
+    def setUp(self):
+        self.engine = visualization_engine.VisualizationEngine()
+        self.addCleanup(self.engine.shutdown)
+        self.orders = pd.DataFrame({
+            'Order Date': pd.date_range('2024-01-01', periods=30).strftime('%Y-%m-%d'),
+            'Total': np.linspace(100, 400, 30)
+        })
+    
+    def test_render_chart_async_matches_direct_render(self):
+        """Test the future resolves to the same chart as a direct call"""
+        self.assertIsNone(self.engine._png_pool)  # pool starts on first use
+        future = self.engine.render_chart_async('generate_revenue_chart', self.orders, 'line')
+        chart = future.result(timeout=60)
+        
+        direct = visualization_engine.VisualizationEngine().generate_revenue_chart(self.orders, 'line')
+        self.assertNotIn('error', chart)
+        self.assertEqual(chart['image'], direct['image'])
+    
+    def test_shutdown_stops_pool(self):
+        """Test shutdown stops the pool and a later render starts a new one"""
+        self.engine.render_chart_async('generate_revenue_chart', self.orders, 'line').result(timeout=60)
+        pool = self.engine._png_pool
+        self.engine.shutdown()
+        self.assertIsNone(self.engine._png_pool)
+        with self.assertRaises(RuntimeError):
+            pool.submit(print)
+        
+        chart = self.engine.render_chart_async('generate_revenue_chart', self.orders, 'line').result(timeout=60)
+        self.assertNotIn('error', chart)
+    
+    def test_exit_hook_does_not_keep_engine_alive(self):
+        """Test the engine can be collected once its pool has started"""
+        engine = visualization_engine.VisualizationEngine()
+        engine.render_chart_async('generate_revenue_chart', self.orders, 'line').result(timeout=60)
+        engine_ref = weakref.ref(engine)
+        del engine
+        gc.collect()
+        self.assertIsNone(engine_ref())
+
+@unittest.skipIf(insights_generator.pl is None, "polars not installed")
+class TestStreamingRevenue(unittest.TestCase):
+    """Test the Polars streaming path for orders CSV files against the pandas path"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+    
+    def _write_csv(self, df):
+        path = os.path.join(self.tmpdir.name, 'orders.csv')
+        df.to_csv(path, index=False)
+        return path
+    
+    def test_csv_path_matches_dataframe(self):
+        """Test a CSV path gives the same insights as the same data as a DataFrame"""
+        rng = np.random.default_rng(1)
+        n = 60
+        path = self._write_csv(pd.DataFrame({
+            'Order Date': pd.date_range('2024-01-01', periods=n).strftime('%Y-%m-%d'),
+            'Total': np.round(rng.uniform(50, 500, n), 2),
+            'Email': [f'customer{i % 7}@test.com' for i in range(n)]
+        }))
+        
+        streamed = insights_generator.InsightsGenerator().generate_comprehensive_insights({'orders': path})
+        in_memory = insights_generator.InsightsGenerator().generate_comprehensive_insights({'orders': pd.read_csv(path)})
+        self.assertEqual(streamed['insights'], in_memory['insights'])
+        self.assertEqual(streamed['recommendations'], in_memory['recommendations'])
+    
+    def test_non_numeric_totals_average_zero(self):
+        """Test the average order value is 0.00 on both paths when no total is numeric"""
+        path = self._write_csv(pd.DataFrame({
+            'Order Date': ['2024-01-01', '2024-01-02'],
+            'Total': ['n/a', 'unknown']
+        }))
+        
+        generator = insights_generator.InsightsGenerator()
+        streamed, _ = generator._run_analyzer('orders', generator._analyze_revenue, path, {'orders'})
+        in_memory, _ = generator._run_analyzer('orders', generator._analyze_revenue, pd.read_csv(path), {'orders'})
+        self.assertIn("📊 Average order value: ₹0.00", streamed['insights'])
+        self.assertEqual(streamed['insights'][:2], in_memory['insights'][:2])
+    
+    def test_sample_capped_at_streaming_sample_rows(self):
+        """Test the streamed sample never exceeds STREAMING_SAMPLE_ROWS rows"""
+        path = self._write_csv(pd.DataFrame({
+            'Order Date': pd.date_range('2024-01-01', periods=25).strftime('%Y-%m-%d'),
+            'Total': np.arange(25, dtype=float)
+        }))
+        
+        generator = insights_generator.InsightsGenerator()
+        with mock.patch.object(insights_generator, 'STREAMING_SAMPLE_ROWS', 10), \
+                mock.patch.object(generator, '_analyze_revenue', wraps=generator._analyze_revenue) as analyze:
+            generator._analyze_revenue_csv(path, set())
+        sample_df = analyze.call_args.args[0]
+        self.assertLessEqual(len(sample_df), 10)
+
+class TestSupabaseConfig(unittest.TestCase):
+    """Test supabase_config against the supabase releases it supports"""
+    
+    def test_import_with_pinned_client_options(self):
+        """Test the module imports when supabase has no SyncClientOptions (pinned 2.0.2 layout)"""
+        # supabase 2.0.2: lib.client_options only defines ClientOptions, with no httpx_client field
+        legacy_options = types.ModuleType('supabase.lib.client_options')
+        legacy_options.ClientOptions = type('ClientOptions', (), {})
+        with mock.patch.dict(sys.modules, {'supabase.lib.client_options': legacy_options}):
+            spec = importlib.util.spec_from_file_location('supabase_config_pinned', supabase_config.__file__)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        
+        self.assertIsNone(module.ClientOptions)
+        self.assertIsNone(module._client_options())
+
+@unittest.skipIf(supabase_config.orjson is None, "orjson not installed")
+class TestSupabaseEncoding(unittest.TestCase):
+    """Test that Supabase request bodies are encoded with orjson"""
+    
+    def test_client_session_uses_orjson(self):
+        """Test the shared client's PostgREST session encodes JSON with orjson"""
+        client = supabase_config._get_client()
+        if client is None:
+            self.skipTest("Supabase client could not be created")
+        
+        session = client.postgrest.session
+        self.assertIsInstance(session, supabase_config._OrjsonEncoding)
+        # stdlib json cannot encode NumPy scalars; orjson can
+        request = session.build_request('POST', 'http://localhost/rest/v1/orders', json={'qty': np.int64(2)})
+        self.assertEqual(request.content, b'{"qty":2}')
+        self.assertEqual(request.headers['content-type'], 'application/json')
+    
+    def test_use_orjson_on_client_subclass(self):
+        """Test older clients whose session is an httpx.Client subclass get orjson encoding"""
+        class SessionClient(httpx.Client):
+            pass
+        
+        session = SessionClient()
+        client = types.SimpleNamespace(postgrest=types.SimpleNamespace(session=session))
+        supabase_config._use_orjson(client)
+        
+        self.assertIsInstance(session, SessionClient)
+        self.assertIsInstance(session, supabase_config._OrjsonEncoding)
+        request = session.build_request('POST', 'http://localhost/rest/v1/orders', json={'qty': np.int64(2)})
+        self.assertEqual(request.content, b'{"qty":2}')
+        session.close()
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,285 +4,198 @@ Integration tests for OLynk AI MVP
 Phase 3: Week 9 - Testing & Quality Assurance
 """
 
-import unittest
 import sys
 import os
-import tempfile
+import io
 import json
-import pandas as pd
+import re
+import pytest
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-# Add backend to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+# Override with OLYNK_URL to run the suite against a remote instance
+BASE_URL = os.environ.get("OLYNK_URL", "http://localhost:5000")
+HEALTH_URL = BASE_URL + "/health"
+UPLOAD_ORDERS_URL = BASE_URL + "/upload/orders"
+UPLOAD_CUSTOMERS_URL = BASE_URL + "/upload/customers"
+UPLOAD_INVALID_URL = BASE_URL + "/upload/invalid_type"
+ANALYTICS_URL = BASE_URL + "/analytics"
+INSIGHTS_URL = BASE_URL + "/insights"
+CHATBOT_URL = BASE_URL + "/chatbot"
+CORRELATIONS_URL = BASE_URL + "/advanced-analysis/correlations"
+REVENUE_CHART_URL = BASE_URL + "/charts/revenue"
+NONEXISTENT_URL = BASE_URL + "/nonexistent"
+TEMPLATE_URL = BASE_URL + "/download-template/"
 
-class TestIntegration(unittest.TestCase):
-    """Integration tests for end-to-end functionality"""
+# JSON request bodies are encoded once and sent as-is with data=
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+_CHAT_BODY = json.dumps({'message': 'What is the total revenue?'}).encode()
+_CHART_BODY = json.dumps({'chart_type': 'line'}).encode()
+_INVALID_JSON_BODY = b'invalid json'
+
+# Tests that upload data share server state, so they run serially on one xdist worker
+# (--dist loadgroup); the read-only tests fan out across the remaining workers
+SERVER_STATE = pytest.mark.xdist_group("server_state")
+
+# Compiled "revenue ... <amount>" patterns, keyed by the analytics revenue figure
+_REV_RE_CACHE = {}
+
+@pytest.fixture(scope="session", autouse=True)
+def server_up(http):
+    """Check /health once for the whole session; the tests below assume the server is up"""
+    try:
+        response = http.get(HEALTH_URL, timeout=5)
+    except requests.exceptions.RequestException as e:
+        pytest.fail(f"Server is not accessible: {e}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data['status'] == 'healthy'
+    return data
+
+def test_server_availability(server_up):
+    """Test if server is running and accessible"""
+    assert server_up['status'] == 'healthy'
+
+@SERVER_STATE
+def test_complete_workflow(http, orders_csv_bytes, customers_csv_bytes):
+    """Test complete end-to-end workflow"""
+    # Server health is checked once by the server_up fixture.
+    # The steps run in two concurrent stages: the uploads, then every read of the uploaded data
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        # Steps 1-2: Upload orders and customers data
+        uploads = {
+            "Step 1: POST /upload/orders": executor.submit(
+                http.post, UPLOAD_ORDERS_URL,
+                files={'file': ('orders.csv', io.BytesIO(orders_csv_bytes), 'text/csv')}),
+            "Step 2: POST /upload/customers": executor.submit(
+                http.post, UPLOAD_CUSTOMERS_URL,
+                files={'file': ('customers.csv', io.BytesIO(customers_csv_bytes), 'text/csv')})
+        }
+        for step, future in uploads.items():
+            response = future.result()
+            assert response.status_code == 200, f"{step} failed: {response.status_code} {response.text}"
+        
+        # Steps 3-7: analytics, insights, chatbot, advanced analytics and chart generation
+        analytics = executor.submit(http.get, ANALYTICS_URL)
+        insights = executor.submit(http.get, INSIGHTS_URL)
+        chat = executor.submit(http.post, CHATBOT_URL, data=_CHAT_BODY, headers=_JSON_HEADERS)
+        correlations = executor.submit(http.post, CORRELATIONS_URL)
+        chart = executor.submit(http.post, REVENUE_CHART_URL, data=_CHART_BODY, headers=_JSON_HEADERS)
     
-    def setUp(self):
-        """Set up test environment"""
-        self.base_url = "http://localhost:5000"
-        
-        # Create sample test data
-        self.sample_orders = pd.DataFrame({
-            'Order ID': [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
-            'Order Date': ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05',
-                          '2024-01-06', '2024-01-07', '2024-01-08', '2024-01-09', '2024-01-10'],
-            'Customer ID': [101, 102, 103, 104, 105, 106, 107, 108, 109, 110],
-            'Customer Name': ['John Doe', 'Jane Smith', 'Bob Johnson', 'Alice Brown', 'Charlie Wilson',
-                            'Diana Davis', 'Edward Miller', 'Fiona Garcia', 'George Martinez', 'Helen Anderson'],
-            'Product ID': [201, 202, 203, 204, 205, 206, 207, 208, 209, 210],
-            'Product Name': ['Product A', 'Product B', 'Product C', 'Product D', 'Product E',
-                           'Product F', 'Product G', 'Product H', 'Product I', 'Product J'],
-            'Quantity': [2, 3, 4, 2, 3, 5, 6, 1, 3, 4],
-            'Unit Price': [50, 60, 70, 80, 90, 100, 110, 120, 130, 140],
-            'Total Amount': [100, 180, 280, 160, 270, 500, 660, 120, 390, 560],
-            'Payment Method': ['Credit Card', 'Cash', 'Credit Card', 'Cash', 'Credit Card',
-                              'Cash', 'Credit Card', 'Cash', 'Credit Card', 'Cash'],
-            'Order Status': ['Completed', 'Completed', 'Completed', 'Completed', 'Completed',
-                           'Completed', 'Completed', 'Completed', 'Completed', 'Completed']
-        })
-        
-        self.sample_customers = pd.DataFrame({
-            'Customer ID': [101, 102, 103, 104, 105, 106, 107, 108, 109, 110],
-            'First Name': ['John', 'Jane', 'Bob', 'Alice', 'Charlie', 'Diana', 'Edward', 'Fiona', 'George', 'Helen'],
-            'Last Name': ['Doe', 'Smith', 'Johnson', 'Brown', 'Wilson', 'Davis', 'Miller', 'Garcia', 'Martinez', 'Anderson'],
-            'Email': ['john@test.com', 'jane@test.com', 'bob@test.com', 'alice@test.com', 'charlie@test.com',
-                     'diana@test.com', 'edward@test.com', 'fiona@test.com', 'george@test.com', 'helen@test.com'],
-            'Registration Date': ['2023-01-01', '2023-02-01', '2023-03-01', '2023-04-01', '2023-05-01',
-                                '2023-06-01', '2023-07-01', '2023-08-01', '2023-09-01', '2023-10-01'],
-            'Total Orders': [5, 7, 3, 4, 6, 8, 2, 9, 1, 10],
-            'Total Spent': [500, 750, 300, 450, 600, 800, 200, 900, 100, 1000],
-            'Average Order Value': [100, 107, 100, 112, 100, 100, 100, 100, 100, 100],
-            'Last Order Date': ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05',
-                               '2024-01-06', '2024-01-07', '2024-01-08', '2024-01-09', '2024-01-10'],
-            'Preferred Payment Method': ['Credit Card', 'Cash', 'Credit Card', 'Cash', 'Credit Card',
-                                       'Cash', 'Credit Card', 'Cash', 'Credit Card', 'Cash'],
-            'Customer Segment': ['Premium', 'Regular', 'Premium', 'Regular', 'Premium',
-                               'Regular', 'Premium', 'Regular', 'Premium', 'Regular']
-        })
-        
-        self.sample_products = pd.DataFrame({
-            'Product ID': [201, 202, 203, 204, 205, 206, 207, 208, 209, 210],
-            'Product Name': ['Product A', 'Product B', 'Product C', 'Product D', 'Product E',
-                           'Product F', 'Product G', 'Product H', 'Product I', 'Product J'],
-            'Category': ['Electronics', 'Clothing', 'Books', 'Home', 'Sports', 'Electronics', 'Clothing', 'Books', 'Home', 'Sports'],
-            'Brand': ['Brand A', 'Brand B', 'Brand C', 'Brand D', 'Brand E', 'Brand F', 'Brand G', 'Brand H', 'Brand I', 'Brand J'],
-            'Price': [50, 60, 70, 80, 90, 100, 110, 120, 130, 140],
-            'Cost': [30, 40, 50, 60, 70, 80, 90, 100, 110, 120],
-            'SKU': ['SKU001', 'SKU002', 'SKU003', 'SKU004', 'SKU005', 'SKU006', 'SKU007', 'SKU008', 'SKU009', 'SKU010'],
-            'Stock Quantity': [100, 150, 200, 250, 300, 350, 400, 450, 500, 550],
-            'Weight (g)': [100, 150, 200, 250, 300, 350, 400, 450, 500, 550],
-            'Dimensions (cm)': ['10x10x10', '15x15x15', '20x20x20', '25x25x25', '30x30x30',
-                              '35x35x35', '40x40x40', '45x45x45', '50x50x50', '55x55x55'],
-            'Launch Date': ['2023-01-01', '2023-02-01', '2023-03-01', '2023-04-01', '2023-05-01',
-                           '2023-06-01', '2023-07-01', '2023-08-01', '2023-09-01', '2023-10-01'],
-            'Last Updated': ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05',
-                            '2024-01-06', '2024-01-07', '2024-01-08', '2024-01-09', '2024-01-10'],
-            'Tags': ['tag1', 'tag2', 'tag3', 'tag4', 'tag5', 'tag6', 'tag7', 'tag8', 'tag9', 'tag10'],
-            'Description': ['Description A', 'Description B', 'Description C', 'Description D', 'Description E',
-                           'Description F', 'Description G', 'Description H', 'Description I', 'Description J'],
-            'Status': ['Active', 'Active', 'Active', 'Active', 'Active', 'Active', 'Active', 'Active', 'Active', 'Active']
-        })
-        
-        self.sample_inventory = pd.DataFrame({
-            'Inventory ID': [301, 302, 303, 304, 305, 306, 307, 308, 309, 310],
-            'Product ID': [201, 202, 203, 204, 205, 206, 207, 208, 209, 210],
-            'Product Name': ['Product A', 'Product B', 'Product C', 'Product D', 'Product E',
-                           'Product F', 'Product G', 'Product H', 'Product I', 'Product J'],
-            'SKU': ['SKU001', 'SKU002', 'SKU003', 'SKU004', 'SKU005', 'SKU006', 'SKU007', 'SKU008', 'SKU009', 'SKU010'],
-            'Location': ['Warehouse A', 'Warehouse B', 'Warehouse C', 'Warehouse D', 'Warehouse E',
-                        'Warehouse F', 'Warehouse G', 'Warehouse H', 'Warehouse I', 'Warehouse J'],
-            'Warehouse': ['Main', 'Main', 'Main', 'Main', 'Main', 'Main', 'Main', 'Main', 'Main', 'Main'],
-            'Current Stock': [100, 150, 200, 250, 300, 350, 400, 450, 500, 550],
-            'Minimum Stock': [10, 15, 20, 25, 30, 35, 40, 45, 50, 55],
-            'Maximum Stock': [1000, 1500, 2000, 2500, 3000, 3500, 4000, 4500, 5000, 5500],
-            'Unit Cost': [30, 40, 50, 60, 70, 80, 90, 100, 110, 120],
-            'Total Value': [3000, 6000, 10000, 15000, 21000, 28000, 36000, 45000, 55000, 66000],
-            'Last Restocked': ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05',
-                             '2024-01-06', '2024-01-07', '2024-01-08', '2024-01-09', '2024-01-10'],
-            'Next Restock Date': ['2024-02-01', '2024-02-02', '2024-02-03', '2024-02-04', '2024-02-05',
-                                '2024-02-06', '2024-02-07', '2024-02-08', '2024-02-09', '2024-02-10'],
-            'Stock Status': ['In Stock', 'In Stock', 'In Stock', 'In Stock', 'In Stock',
-                           'In Stock', 'In Stock', 'In Stock', 'In Stock', 'In Stock'],
-            'Category': ['Electronics', 'Clothing', 'Books', 'Home', 'Sports', 'Electronics', 'Clothing', 'Books', 'Home', 'Sports'],
-            'Supplier': ['Supplier A', 'Supplier B', 'Supplier C', 'Supplier D', 'Supplier E',
-                        'Supplier F', 'Supplier G', 'Supplier H', 'Supplier I', 'Supplier J'],
-            'Lead Time (Days)': [7, 10, 14, 21, 30, 7, 10, 14, 21, 30],
-            'Reorder Point': [20, 30, 40, 50, 60, 70, 80, 90, 100, 110]
-        })
+    # Step 3: Get analytics
+    response = analytics.result()
+    assert response.status_code == 200, f"Step 3: GET /analytics failed: {response.status_code} {response.text}"
+    data = response.json()
+    assert 'total_revenue' in data
+    assert 'total_customers' in data
+    assert data['total_customers'] == 10
     
-    def test_server_availability(self):
-        """Test if server is running and accessible"""
-        try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
-            self.assertEqual(response.status_code, 200)
-            data = response.json()
-            self.assertEqual(data['status'], 'healthy')
-        except requests.exceptions.RequestException as e:
-            self.fail(f"Server is not accessible: {e}")
+    # Step 4: Get insights
+    response = insights.result()
+    assert response.status_code == 200, f"Step 4: GET /insights failed: {response.status_code} {response.text}"
+    data = response.json()
+    assert 'insights' in data
+    assert len(data['insights']) > 0
     
-    def test_complete_workflow(self):
-        """Test complete end-to-end workflow"""
-        # Step 1: Check server health
-        response = requests.get(f"{self.base_url}/health")
-        self.assertEqual(response.status_code, 200)
-        
-        # Step 2: Upload orders data
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            self.sample_orders.to_csv(f.name, index=False)
-            f.flush()
-            
-            with open(f.name, 'rb') as csv_file:
-                files = {'file': ('orders.csv', csv_file, 'text/csv')}
-                response = requests.post(f"{self.base_url}/upload/orders", files=files)
-        
-        os.unlink(f.name)
-        self.assertEqual(response.status_code, 200)
-        
-        # Step 3: Upload customers data
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            self.sample_customers.to_csv(f.name, index=False)
-            f.flush()
-            
-            with open(f.name, 'rb') as csv_file:
-                files = {'file': ('customers.csv', csv_file, 'text/csv')}
-                response = requests.post(f"{self.base_url}/upload/customers", files=files)
-        
-        os.unlink(f.name)
-        self.assertEqual(response.status_code, 200)
-        
-        # Step 4: Get analytics
-        response = requests.get(f"{self.base_url}/analytics")
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertIn('total_revenue', data)
-        self.assertIn('total_customers', data)
-        self.assertEqual(data['total_customers'], 10)
-        
-        # Step 5: Get insights
-        response = requests.get(f"{self.base_url}/insights")
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertIn('insights', data)
-        self.assertGreater(len(data['insights']), 0)
-        
-        # Step 6: Test chatbot
-        response = requests.post(f"{self.base_url}/chatbot",
-                               json={'message': 'What is the total revenue?'})
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertIn('response', data)
-        
-        # Step 7: Test advanced analytics
-        response = requests.post(f"{self.base_url}/advanced-analysis/correlations")
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertIn('variables_analyzed', data)
-        
-        # Step 8: Test chart generation
-        response = requests.post(f"{self.base_url}/charts/revenue",
-                               json={'chart_type': 'line'})
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertIn('image', data)
+    # Step 5: Test chatbot
+    response = chat.result()
+    assert response.status_code == 200, f"Step 5: POST /chatbot failed: {response.status_code} {response.text}"
+    data = response.json()
+    assert 'response' in data
     
-    def test_performance_under_load(self):
-        """Test performance under load"""
-        # Upload multiple files quickly
-        start_time = time.time()
-        
-        for i in range(5):
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-                # Create a smaller dataset for performance testing
-                test_data = self.sample_orders.head(100)
-                test_data.to_csv(f.name, index=False)
-                f.flush()
-                
-                with open(f.name, 'rb') as csv_file:
-                    files = {'file': (f'orders_{i}.csv', csv_file, 'text/csv')}
-                    response = requests.post(f"{self.base_url}/upload/orders", files=files)
-                
-                os.unlink(f.name)
-                self.assertEqual(response.status_code, 200)
-        
-        end_time = time.time()
-        total_time = end_time - start_time
-        
-        # Should complete within reasonable time (5 seconds for 5 uploads)
-        self.assertLess(total_time, 5.0)
+    # Step 6: Test advanced analytics
+    response = correlations.result()
+    assert response.status_code == 200, f"Step 6: POST /advanced-analysis/correlations failed: {response.status_code} {response.text}"
+    data = response.json()
+    assert 'variables_analyzed' in data
     
-    def test_error_handling(self):
-        """Test error handling scenarios"""
-        # Test invalid file type
-        response = requests.post(f"{self.base_url}/upload/invalid_type")
-        self.assertEqual(response.status_code, 400)
-        
-        # Test upload without file
-        response = requests.post(f"{self.base_url}/upload/orders")
-        self.assertEqual(response.status_code, 400)
-        
-        # Test invalid JSON in chatbot
-        response = requests.post(f"{self.base_url}/chatbot",
-                               data='invalid json',
-                               headers={'Content-Type': 'application/json'})
-        self.assertEqual(response.status_code, 400)
-        
-        # Test non-existent endpoint
-        response = requests.get(f"{self.base_url}/nonexistent")
-        self.assertEqual(response.status_code, 404)
+    # Step 7: Test chart generation
+    response = chart.result()
+    assert response.status_code == 200, f"Step 7: POST /charts/revenue failed: {response.status_code} {response.text}"
+    data = response.json()
+    assert 'image' in data
+
+@SERVER_STATE
+def test_performance_under_load(http, perf_orders_csv_bytes):
+    """Test performance under load"""
+    # Upload multiple files concurrently (the server is I/O-bound per request)
+    start_time = time.time()
     
-    def test_data_consistency(self):
-        """Test data consistency across endpoints"""
-        # Upload data
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            self.sample_orders.to_csv(f.name, index=False)
-            f.flush()
-            
-            with open(f.name, 'rb') as csv_file:
-                files = {'file': ('orders.csv', csv_file, 'text/csv')}
-                response = requests.post(f"{self.base_url}/upload/orders", files=files)
-        
-        os.unlink(f.name)
-        self.assertEqual(response.status_code, 200)
-        
-        # Check analytics
-        response = requests.get(f"{self.base_url}/analytics")
-        self.assertEqual(response.status_code, 200)
-        analytics_data = response.json()
-        
-        # Check insights
-        response = requests.get(f"{self.base_url}/insights")
-        self.assertEqual(response.status_code, 200)
-        insights_data = response.json()
-        
-        # Verify revenue is consistent
-        revenue_in_analytics = analytics_data.get('total_revenue', 0)
-        
-        # Check if revenue appears in insights
-        revenue_in_insights = False
-        for insight in insights_data.get('insights', []):
-            if 'revenue' in insight.lower() and str(revenue_in_analytics) in insight:
-                revenue_in_insights = True
-                break
-        
-        # If we have revenue data, it should be consistent
-        if revenue_in_analytics > 0:
-            self.assertTrue(revenue_in_insights, "Revenue should be consistent between analytics and insights")
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(http.post, UPLOAD_ORDERS_URL,
+                                   files={'file': (f'orders_{i}.csv', io.BytesIO(perf_orders_csv_bytes), 'text/csv')})
+                   for i in range(5)]
+        for future in futures:
+            assert future.result().status_code == 200
     
-    def test_template_downloads(self):
-        """Test template download functionality"""
-        template_types = ['products', 'orders', 'customers', 'inventory']
-        
-        for template_type in template_types:
-            response = requests.get(f"{self.base_url}/download-template/{template_type}")
-            # Should either return 200 (if template exists) or 404 (if not)
-            self.assertIn(response.status_code, [200, 404])
-            
-            if response.status_code == 200:
-                # Check if it's actually CSV content
-                content_type = response.headers.get('content-type', '')
-                self.assertIn('text/csv', content_type)
+    end_time = time.time()
+    total_time = end_time - start_time
+    
+    # Should complete within reasonable time (5 seconds for 5 uploads)
+    assert total_time < 5.0
 
-if __name__ == '__main__':
-    unittest.main()
+def test_error_handling(http):
+    """Test error handling scenarios"""
+    # Test invalid file type
+    response = http.post(UPLOAD_INVALID_URL)
+    assert response.status_code == 400
+    
+    # Test upload without file
+    response = http.post(UPLOAD_ORDERS_URL)
+    assert response.status_code == 400
+    
+    # Test invalid JSON in chatbot
+    response = http.post(CHATBOT_URL,
+                         data=_INVALID_JSON_BODY,
+                         headers=_JSON_HEADERS)
+    assert response.status_code == 400
+    
+    # Test non-existent endpoint
+    response = http.get(NONEXISTENT_URL)
+    assert response.status_code == 404
+
+@SERVER_STATE
+def test_data_consistency(http, orders_csv_bytes):
+    """Test data consistency across endpoints"""
+    # Upload data
+    files = {'file': ('orders.csv', io.BytesIO(orders_csv_bytes), 'text/csv')}
+    response = http.post(UPLOAD_ORDERS_URL, files=files)
+    assert response.status_code == 200
+    
+    # Check analytics
+    response = http.get(ANALYTICS_URL)
+    assert response.status_code == 200
+    analytics_data = response.json()
+    
+    # Check insights
+    response = http.get(INSIGHTS_URL)
+    assert response.status_code == 200
+    insights_data = response.json()
+    
+    # Verify revenue is consistent
+    revenue_in_analytics = analytics_data.get('total_revenue', 0)
+    
+    # Check if revenue appears in insights
+    pattern = _REV_RE_CACHE.get(revenue_in_analytics)
+    if pattern is None:
+        amount = re.escape(str(revenue_in_analytics))
+        pattern = _REV_RE_CACHE[revenue_in_analytics] = re.compile(
+            rf'revenue.*{amount}|{amount}.*revenue', re.IGNORECASE | re.DOTALL)
+    revenue_in_insights = any(pattern.search(insight) for insight in insights_data.get('insights', []))
+    
+    # If we have revenue data, it should be consistent
+    if revenue_in_analytics > 0:
+        assert revenue_in_insights, "Revenue should be consistent between analytics and insights"
+
+@pytest.mark.parametrize("template_type", ['products', 'orders', 'customers', 'inventory'])
+def test_template_downloads(http, template_type):
+    """Test template download functionality"""
+    response = http.get(TEMPLATE_URL + template_type)
+    # Should either return 200 (if template exists) or 404 (if not)
+    assert response.status_code in [200, 404]
+    
+    if response.status_code == 200:
+        # Check if it's actually CSV content
+        content_type = response.headers.get('content-type', '')
+        assert 'text/csv' in content_type